@@ -1,86 +1,147 @@
-import math
+import os
+import sys
 import heapq
+from collections import OrderedDict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.geodesic import distance_matrix
+from utils.search_nodes import NodeArena
+from utils.stats import NO_STATS
+
 
 class AStarTSP:
-    def __init__(self, cities):
+    def __init__(self, cities, dist=None, mst_cache_size=200_000):
         self.cities = cities
-        self.R = 6371.0
+        self.names = list(cities.keys())
+        self.index = {name: i for i, name in enumerate(self.names)}
+        if dist is None:
+            dist = distance_matrix(list(cities.values()))
+        # nested lists: scalar lookups in the search loop are much faster than on a numpy array
+        self.dist = dist.tolist() if hasattr(dist, "tolist") else dist
+        # MST cost per unvisited bitmask, least recently used entries are evicted first
+        self.mst_cache_size = mst_cache_size
+        self._mst_cache = OrderedDict()
 
-    def haversine_distance(self, c1, c2):
-        lat1, lon1 = math.radians(c1[0]), math.radians(c1[1])
-        lat2, lon2 = math.radians(c2[0]), math.radians(c2[1])
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = math.sin(dlat / 2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2)**2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        return self.R * c
+    def distance(self, a, b):
+        return self.dist[a][b]
 
-    distance = haversine_distance
+    @staticmethod
+    def members(mask):
+        cities = []
+        while mask:
+            low = mask & -mask
+            cities.append(low.bit_length() - 1)
+            mask ^= low
+        return cities
 
-    def mst_heuristic(self, unvisited):
-        if len(unvisited) < 2:
-            return 0
-        points = [self.cities[city] for city in unvisited]
-        min_edges = []
-        for i in range(len(points)):
-            for j in range(i + 1, len(points)):
-                min_edges.append((self.distance(points[i], points[j]), i, j))
-        min_edges.sort()
-        parent = list(range(len(points)))
-        def find(x):
-            if parent[x] != x:
-                parent[x] = find(parent[x])
-            return parent[x]
+    def _prim(self, points):
+        # O(k^2) Prim على المصفوفة مباشرة من غير sort
+        d = self.dist
+        rest = points[1:]
+        key = [d[points[0]][v] for v in rest]
         mst_cost = 0
-        edges_used = 0
-        for dist, u, v in min_edges:
-            pu, pv = find(u), find(v)
-            if pu != pv:
-                parent[pu] = pv
-                mst_cost += dist
-                edges_used += 1
-                if edges_used == len(points) - 1:
-                    break
+        while rest:
+            best = min(range(len(rest)), key=key.__getitem__)
+            mst_cost += key[best]
+            row = d[rest[best]]
+            rest[best], key[best] = rest[-1], key[-1]
+            rest.pop()
+            key.pop()
+            for i, v in enumerate(rest):
+                if row[v] < key[i]:
+                    key[i] = row[v]
         return mst_cost
 
+    def mst_heuristic(self, unvisited):
+        cache = self._mst_cache
+        cost = cache.get(unvisited)
+        if cost is not None:
+            cache.move_to_end(unvisited)
+            return cost
+        points = self.members(unvisited)
+        cost = self._prim(points) if len(points) >= 2 else 0
+        cache[unvisited] = cost
+        if len(cache) > self.mst_cache_size:
+            cache.popitem(last=False)
+        return cost
+
     def heuristic(self, current, unvisited):
         if not unvisited:
             return 0
         # أقرب مدينة + MST للباقي
-        min_to_next = min(self.distance(self.cities[current], self.cities[c]) for c in unvisited)
+        row = self.dist[current]
+        min_to_next = min(row[c] for c in self.members(unvisited))
         mst_remaining = self.mst_heuristic(unvisited)
         return min_to_next + mst_remaining
 
-    def solve(self, start):
-        n = len(self.cities)
+    def solve(self, start, stats=NO_STATS):
+        start = self.index[start]
+        n = len(self.names)
+        if n > 63:
+            raise ValueError("AStarTSP supports at most 63 cities (unvisited set is a 64-bit mask)")
         best_cost = float('inf')
-        best_path = None
+        best_node = -1
+        self.stats = {"nodes_expanded": 0, "nodes_pruned_bound": 0, "nodes_pruned_dominated": 0}
+
+        # كل node في الـ heap هي (f, g, node_id) بس، والمسار بيتبني من الـ parent pointers في الآخر
+        nodes = NodeArena()
+        add_node = nodes.add
+        node_city, node_mask = nodes.city, nodes.mask
 
+        # أقل g وصلنا بيه لكل حالة (unvisited mask, current) - زي visited في ucs_tsp
+        best_g = {}
+        all_unvisited = ((1 << n) - 1) ^ (1 << start)
+        best_g[all_unvisited * n + start] = 0
+        # مع timers بيتحسب وقت الـ heuristic لوحده
+        heuristic = stats.timed("heuristic", self.heuristic)
         pq = []
-        heapq.heappush(pq, (0 + self.heuristic(start, set(self.cities.keys()) - {start}), 0, start, [start], set(self.cities.keys()) - {start}))
+        heapq.heappush(pq, (0 + heuristic(start, all_unvisited), 0, add_node(-1, start, all_unvisited)))
+        peak_heap = 1
 
         while pq:
-            _, cost_so_far, current, path, unvisited = heapq.heappop(pq)
+            if len(pq) > peak_heap:
+                peak_heap = len(pq)
+            _, cost_so_far, node_id = heapq.heappop(pq)
+            current, unvisited = node_city[node_id], node_mask[node_id]
 
             if cost_so_far >= best_cost:
+                self.stats["nodes_pruned_bound"] += 1
                 continue  # pruning
+            if cost_so_far > best_g[unvisited * n + current]:
+                self.stats["nodes_pruned_dominated"] += 1
+                continue  # a cheaper path to the same state was pushed later
+            self.stats["nodes_expanded"] += 1
 
             if not unvisited:
-                return_cost = cost_so_far + self.distance(self.cities[current], self.cities[start])
+                return_cost = cost_so_far + self.distance(current, start)
                 if return_cost < best_cost:
                     best_cost = return_cost
-                    best_path = path + [start]
+                    best_node = node_id
+                    stats.improved(best_cost)
                 continue
 
-            for next_city in unvisited:
-                new_cost = cost_so_far + self.distance(self.cities[current], self.cities[next_city])
-                new_unvisited = unvisited - {next_city}
-                h = self.heuristic(next_city, new_unvisited)
+            row = self.dist[current]
+            for next_city in self.members(unvisited):
+                new_cost = cost_so_far + row[next_city]
+                new_unvisited = unvisited ^ (1 << next_city)
+                key = new_unvisited * n + next_city
+                if best_g.get(key, float('inf')) <= new_cost:
+                    self.stats["nodes_pruned_dominated"] += 1
+                    continue
+                h = heuristic(next_city, new_unvisited)
                 estimated_total = new_cost + h
 
                 if estimated_total >= best_cost:
+                    self.stats["nodes_pruned_bound"] += 1
                     continue  # pruning قوي
 
-                heapq.heappush(pq, (estimated_total, new_cost, next_city, path + [next_city], new_unvisited))
+                best_g[key] = new_cost
+                heapq.heappush(pq, (estimated_total, new_cost, add_node(node_id, next_city, new_unvisited)))
 
-        return best_path, best_cost
\ No newline at end of file
+        self.stats["nodes_stored"] = len(nodes)
+        self.stats["node_arena_bytes"] = nodes.nbytes()
+        stats.update(self.stats)
+        stats.peak("peak_heap_size", peak_heap)
+        if best_node == -1:
+            return None, best_cost
+        return [self.names[i] for i in nodes.path(best_node) + [start]], best_cost
@@ -0,0 +1,107 @@
+import os
+import sys
+from collections import OrderedDict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+# a_star.py جنبه في نفس الفولدر، حتى لو ida_star اتعمله import من بره
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from a_star import AStarTSP
+from utils.stats import NO_STATS
+
+# تقريباً حجم entry واحدة في الـ MST cache (OrderedDict node + int key + float)
+_CACHE_ENTRY_BYTES = 160
+
+
+class IDAStarTSP(AStarTSP):
+    """Iterative-deepening A* on the same MST heuristic.
+
+    Memory is the current path plus two bounded LRU tables (the MST cache and a
+    transposition table of best g per state), which share memory_limit_mb.
+    """
+
+    def __init__(self, cities, dist=None, memory_limit_mb=64, threshold_growth=1.05):
+        entries = max(1, memory_limit_mb * 1024 * 1024 // (2 * _CACHE_ENTRY_BYTES))
+        super().__init__(cities, dist, mst_cache_size=entries)
+        self.table_size = entries
+        # plain IDA* (1.0) crawls with real-valued costs; > 1.0 skips thresholds faster and the
+        # result stays optimal because we keep searching until the best tour is no worse than
+        # every f-value that was cut off
+        self.threshold_growth = threshold_growth
+
+    def solve(self, start, stats=NO_STATS):
+        start = self.index[start]
+        n = len(self.names)
+        if n > 63:
+            raise ValueError("IDAStarTSP supports at most 63 cities (unvisited set is a 64-bit mask)")
+        self.stats = {"nodes_expanded": 0, "nodes_pruned_bound": 0, "nodes_pruned_dominated": 0, "iterations": 0}
+        self._start = start
+        self._best_cost = float('inf')
+        self._best_path = None
+        self._stats = stats
+        self._heuristic = stats.timed("heuristic", self.heuristic)
+
+        path = [start]
+        unvisited = ((1 << n) - 1) ^ (1 << start)
+        threshold = self._heuristic(start, unvisited)
+        while True:
+            self.stats["iterations"] += 1
+            self._next_threshold = float('inf')
+            # (unvisited, city) -> best g in this iteration; only valid for the current threshold
+            self._table = OrderedDict()
+            self._dfs(start, unvisited, 0, threshold, path)
+            # كل الـ nodes اللي اتقطعت كان f بتاعها >= next_threshold، فلو أحسن حل أقل منه يبقى optimal
+            if self._best_cost <= self._next_threshold:
+                break
+            threshold = max(self._next_threshold, threshold * self.threshold_growth)
+            stats.emit("iteration", threshold=threshold, nodes_expanded=self.stats["nodes_expanded"])
+
+        self.stats["final_threshold"] = threshold
+        stats.update(self.stats)
+        if self._best_path is None:
+            return None, self._best_cost
+        return [self.names[i] for i in self._best_path], self._best_cost
+
+    def _dfs(self, current, unvisited, cost_so_far, threshold, path):
+        table = self._table
+        key = unvisited * len(self.names) + current
+        seen = table.get(key)
+        if seen is not None and seen <= cost_so_far:
+            table.move_to_end(key)
+            self.stats["nodes_pruned_dominated"] += 1
+            return
+        table[key] = cost_so_far
+        if len(table) > self.table_size:
+            table.popitem(last=False)
+
+        self.stats["nodes_expanded"] += 1
+        if not unvisited:
+            total = cost_so_far + self.distance(current, self._start)
+            if total < self._best_cost:
+                self._best_cost = total
+                self._best_path = path + [self._start]
+                self._stats.improved(total)
+            return
+
+        row = self.dist[current]
+        children = []
+        for next_city in self.members(unvisited):
+            new_cost = cost_so_far + row[next_city]
+            new_unvisited = unvisited ^ (1 << next_city)
+            f = new_cost + self._heuristic(next_city, new_unvisited)
+            if f >= self._best_cost:
+                self.stats["nodes_pruned_bound"] += 1
+            elif f > threshold:
+                if f < self._next_threshold:
+                    self._next_threshold = f
+            else:
+                children.append((f, new_cost, next_city, new_unvisited))
+
+        # الأقل f الأول عشان نلاقي حل كويس بدري ونقص بيه الباقي
+        children.sort()
+        for f, new_cost, next_city, new_unvisited in children:
+            if f >= self._best_cost:
+                self.stats["nodes_pruned_bound"] += 1
+                continue
+            path.append(next_city)
+            self._dfs(next_city, new_unvisited, new_cost, threshold, path)
+            path.pop()
@@ -1,8 +1,9 @@
-import webbrowser
 import time
 from cities import group_5, group_15, group_20
 from a_star import AStarTSP
+from ida_star import IDAStarTSP
 from map_view import draw_map
+from utils.visualization import headless, open_in_browser
 
 print("=== TSP Solver for Egyptian Cities ===")
 print("Choose the group size: 5, 15, or 20 cities (fixed groups, no randomness)\n")
@@ -29,6 +30,10 @@ else:
     selected_cities = group_20
     print("\nYou selected: Large Group (20 cities - All cities)")
 
+# اختيار نوع البحث: A* العادي أو IDA* بذاكرة محدودة
+mode = input("Search mode (1 = A*, 2 = IDA* memory-bounded) [1]: ").strip()
+use_ida = mode == "2"
+
 # عرض المدن المتاحة مرتبة أبجديًا
 city_names = sorted(selected_cities.keys())
 print("\nAvailable cities in this group:")
@@ -43,7 +48,7 @@ print(f"\nSolving optimal TSP tour starting and ending at {default_start}...")
 start_time = time.time()
 
 # تشغيل A* Search
-solver = AStarTSP(selected_cities)
+solver = IDAStarTSP(selected_cities, memory_limit_mb=64) if use_ida else AStarTSP(selected_cities)
 path, cost = solver.solve(default_start)
 
 # قياس وقت النهاية
@@ -52,12 +57,16 @@ execution_time = end_time - start_time
 
 # عرض النتيجة
 print("\n" + "="*60)
-print("Best optimal path found (A* Search with MST heuristic):")
+print(f"Best optimal path found ({'IDA*' if use_ida else 'A*'} Search with MST heuristic):")
 print(" → ".join(path))
 print(f"Total distance: {round(cost, 2)} km")
 print(f"Execution time: {execution_time:.4f} seconds")
+print(f"Nodes expanded: {solver.stats['nodes_expanded']}, "
+      f"pruned by bound: {solver.stats['nodes_pruned_bound']}, "
+      f"pruned as dominated: {solver.stats['nodes_pruned_dominated']}")
 print("="*60)
 
-draw_map(selected_cities, path, algorithm_name="A* Algorithm")
-print("\nMap generated successfully! Opening in browser...")
-webbrowser.open("tsp_egypt_map.html")
\ No newline at end of file
+if not headless():
+    draw_map(selected_cities, path, algorithm_name="IDA* Algorithm" if use_ida else "A* Algorithm")
+    print("\nMap generated successfully! Opening in browser...")
+    open_in_browser("tsp_egypt_map.html")
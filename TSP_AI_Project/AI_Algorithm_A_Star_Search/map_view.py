@@ -1,9 +1,10 @@
 # map_view.py (النسخة المعدلة)
 
-import folium
-from folium.plugins import PolyLineTextPath
-
 def draw_map(cities, path, algorithm_name="A* Algorithm"):
+    # folium بيتعمله import هنا بس عشان a_star / ida_star يفضلوا خفاف
+    import folium
+    from folium.plugins import PolyLineTextPath
+
     start_city = path[0]
     end_city = path[-1]
 
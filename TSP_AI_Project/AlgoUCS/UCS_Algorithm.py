@@ -1,11 +1,15 @@
 import heapq
-import math
 import time
-import folium
 import os
-import webbrowser
+import sys
 import random
-from folium.plugins import PolyLineTextPath
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.geodesic import distance_matrix
+from utils.search_nodes import NodeArena
+from utils.stats import NO_STATS
+from utils.visualization import headless, open_in_browser
+from held_karp import held_karp
 
 cities_5 = {
     "Cairo": [30.04, 31.23], "Alexandria": [31.20, 29.91], "Luxor": [25.68, 32.64],
@@ -29,50 +33,80 @@ cities_20 = {
     "Sharm": [27.91, 34.32], "Matruh": [31.35, 27.23], "Zagazig": [30.58, 31.50],
     "Damietta": [31.41, 31.81], "Damanhur": [31.03, 30.47]
 }
-def calculate_distance(coord1, coord2):
-    R = 6371
-    lat1, lon1 = math.radians(coord1[0]), math.radians(coord1[1])
-    lat2, lon2 = math.radians(coord2[0]), math.radians(coord2[1])
-    dlat, dlon = lat2 - lat1, lon2 - lon1
-    a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
-    return R * (2 * math.atan2(math.sqrt(a), math.sqrt(1 - a)))
-
-
 def get_dist_matrix(cities_dict):
     names = list(cities_dict.keys())
-    n = len(names)
-    matrix = [[0] * n for _ in range(n)]
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                matrix[i][j] = calculate_distance(cities_dict[names[i]], cities_dict[names[j]])
+    matrix = distance_matrix(list(cities_dict.values())).tolist()
     return matrix, names
 
 
-def ucs_tsp(dist_matrix, start_index):
+def ucs_tsp(dist_matrix, start_index, stats=NO_STATS):
     n = len(dist_matrix)
-    pq = [(0, start_index, 1 << start_index, [start_index])]
-    visited = {}
+    if n > 63:
+        raise ValueError("ucs_tsp supports at most 63 cities (visited set is a 64-bit mask)")
+    if n == 1:
+        # الرجوع للبداية من غير أي مدينة تانية مبيعديش على الـ visited check (0 > 0)
+        stats.update({"nodes_expanded": 0, "nodes_pruned_dominated": 0, "nodes_stored": 0, "node_arena_bytes": 0})
+        stats.peak("peak_heap_size", 0)
+        return [start_index, start_index], 0.0
+    full = (1 << n) - 1
+    # heap entries are (cost, node_id); city, mask and parent live in the arena
+    nodes = NodeArena()
+    node_city, node_mask = nodes.city, nodes.mask
+    pq = [(0, nodes.add(-1, start_index, 1 << start_index))]
+    # أقل تكلفة اتعملها push لكل حالة (mask, city)؛ الأغلى منها مبيدخلش الـ heap أصلاً
+    visited = {(1 << start_index) * n + start_index: 0}
+    # counters محلية وبتتنشر مرة واحدة في الآخر
+    expanded = stale = dominated = peak_heap = 0
+    path, best = None, float('inf')
 
     while pq:
-        cost, curr, mask, path = heapq.heappop(pq)
+        if len(pq) > peak_heap:
+            peak_heap = len(pq)
+        cost, node_id = heapq.heappop(pq)
+        curr, mask = node_city[node_id], node_mask[node_id]
 
-        if (mask, curr) in visited and visited[(mask, curr)] <= cost:
+        if visited[mask * n + curr] < cost:
+            stale += 1
             continue
-        visited[(mask, curr)] = cost
 
-        if len(path) == n:
-            total_cost = cost + dist_matrix[curr][start_index]
-            return path + [start_index], total_cost
+        # الرجوع لمدينة البداية هو آخر خطوة، فأول مرة نطلعه من الـ heap يبقى هو الأقل تكلفة
+        if mask == full and curr == start_index and node_id != 0:
+            path, best = nodes.path(node_id), cost
+            break
+        expanded += 1
+
+        if mask == full:
+            new_cost = cost + dist_matrix[curr][start_index]
+            if visited.get(mask * n + start_index, float('inf')) > new_cost:
+                visited[mask * n + start_index] = new_cost
+                heapq.heappush(pq, (new_cost, nodes.add(node_id, start_index, mask)))
+            continue
 
+        row = dist_matrix[curr]
         for next_city in range(n):
             if not (mask & (1 << next_city)):
-                new_cost = cost + dist_matrix[curr][next_city]
-                heapq.heappush(pq, (new_cost, next_city, mask | (1 << next_city), path + [next_city]))
-    return None, float('inf')
+                new_cost = cost + row[next_city]
+                new_mask = mask | (1 << next_city)
+                key = new_mask * n + next_city
+                if visited.get(key, float('inf')) <= new_cost:
+                    dominated += 1
+                    continue
+                visited[key] = new_cost
+                heapq.heappush(pq, (new_cost, nodes.add(node_id, next_city, new_mask)))
+
+    stats.update({"nodes_expanded": expanded, "nodes_pruned_dominated": dominated + stale,
+                  "nodes_stored": len(nodes), "node_arena_bytes": nodes.nbytes()})
+    # high-water mark: لو نفس الـ stats اتستخدم في أكتر من run بيفضل الأكبر
+    stats.peak("peak_heap_size", peak_heap)
+    return path, best
 
 
 def draw_map(selected_cities, path_names, algorithm_name="Uniform Cost Search (UCS)"):
+    if headless():
+        return
+    import folium
+    from folium.plugins import PolyLineTextPath
+
     first_city_coords = selected_cities[path_names[0]]
     m = folium.Map(location=first_city_coords, zoom_start=6)
 
@@ -113,7 +147,7 @@ def draw_map(selected_cities, path_names, algorithm_name="Uniform Cost Search (U
     file_path = "tsp_ucs_result.html"
     m.save(file_path)
     print(f"\nMap saved to: {file_path}")
-    webbrowser.open('file://' + os.path.realpath(file_path))
+    open_in_browser(file_path)
 
 
 def main():
@@ -129,13 +163,21 @@ def main():
     else:
         selected_cities = cities_5
 
+    mode = input("Solver mode (1 = UCS, 2 = Held-Karp DP) [1]: ").strip()
+    use_held_karp = mode == '2'
+    algorithm_name = "Held-Karp Dynamic Programming" if use_held_karp else "Uniform Cost Search (UCS)"
+
     dist_matrix, city_names = get_dist_matrix(selected_cities)
     start_idx = random.randint(0, len(city_names) - 1)
 
     print(f"Starting City: {city_names[start_idx]}")
 
     start_time = time.time()
-    path_indices, total_dist = ucs_tsp(dist_matrix, start_idx)
+    if use_held_karp:
+        # serial: الـ workers مكسبوش حاجة لحد 20 مدينة (4 workers = 2.4s مقابل 2.1s serial)
+        path_indices, total_dist = held_karp(dist_matrix, start_idx)
+    else:
+        path_indices, total_dist = ucs_tsp(dist_matrix, start_idx)
     end_time = time.time()
 
     if path_indices:
@@ -145,7 +187,7 @@ def main():
         print(f"Execution Time: {end_time - start_time:.5f} Seconds")
 
         # استدعاء الخريطة مع اسم الخوارزمية
-        draw_map(selected_cities, path_names, algorithm_name="Uniform Cost Search (UCS)")
+        draw_map(selected_cities, path_names, algorithm_name=algorithm_name)
     else:
         print("No solution found.")
 
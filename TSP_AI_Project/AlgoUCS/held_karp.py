@@ -0,0 +1,141 @@
+import math
+import os
+import sys
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.geodesic import tour_length
+
+DEFAULT_MAX_MEMORY = 2 * 1024 ** 3
+
+
+def held_karp_memory_estimate(n):
+    """Peak bytes of held_karp on n cities, temporaries included."""
+    m = max(n - 1, 0)
+    subsets = 1 << m
+    # _subsets_by_size: masks (int64) + popcount (int8) + الـ (masks >> bit) & 1 (int64 مرتين) والـ astype
+    setup = subsets * (8 + 1 + 8 + 8 + 1)
+    # dp (float32) + parent (int8) على كل (subset, last city)، و الـ order (int64)
+    table = subsets * m * (4 + 1) + subsets * 8
+    # _relax_layer على أكبر layer: الـ shift/and/compare على الـ layer، وللـ masks اللي فيها j:
+    # dp[...] + d[:, j] (float32 مرتين) و ~56 byte لكل mask (masks و xor و argmin و arange والـ fancy indexing، متقاسة)
+    layer = math.comb(m, m // 2)
+    with_j = math.comb(m - 1, (m - 1) // 2) if m else 0
+    relax = layer * (8 + 8 + 1) + with_j * (2 * m * 4 + 56)
+    return max(setup, table + relax)
+
+
+def _subsets_by_size(m):
+    masks = np.arange(1 << m, dtype=np.int64)
+    popcount = np.zeros(1 << m, dtype=np.int8)
+    for bit in range(m):
+        popcount += ((masks >> bit) & 1).astype(np.int8)
+    order = np.argsort(popcount, kind="stable")
+    bounds = np.searchsorted(popcount[order], np.arange(m + 2))
+    return order, bounds
+
+
+def _relax_layer(dp, parent, d, layer, js):
+    # dp[S, j] = min_i dp[S - {j}, i] + d[i, j]   لكل S في الـ layer فيها j
+    for j in js:
+        masks = layer[(layer >> j) & 1 == 1]
+        if len(masks) == 0:
+            continue
+        cand = dp[masks ^ (1 << j)] + d[:, j]
+        best = np.argmin(cand, axis=1)
+        dp[masks, j] = cand[np.arange(len(masks)), best]
+        parent[masks, j] = best
+
+
+# worker-process state, filled once by _init_worker
+_shared = {}
+
+
+def _init_worker(names, m, d):
+    _shared.clear()
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    _shared["blocks"] = blocks
+    _shared["dp"] = np.ndarray((1 << m, m), dtype=np.float32, buffer=blocks[0].buf)
+    _shared["parent"] = np.ndarray((1 << m, m), dtype=np.int8, buffer=blocks[1].buf)
+    _shared["order"] = np.ndarray(1 << m, dtype=np.int64, buffer=blocks[2].buf)
+    _shared["d"] = d
+
+
+def _worker_task(args):
+    lo, hi, js = args
+    _relax_layer(_shared["dp"], _shared["parent"], _shared["d"], _shared["order"][lo:hi], js)
+
+
+def held_karp(dist_matrix, start_index=0, workers=1, max_memory=DEFAULT_MAX_MEMORY):
+    dist = np.asarray(dist_matrix, dtype=np.float64)
+    n = len(dist)
+    if n <= 3:
+        path = [start_index] + [c for c in range(n) if c != start_index] + [start_index]
+        return path, tour_length(path[:-1], dist)
+    # الـ estimate بيكبر أسرع من أي limit، فبيمنع برضه الـ int8 parent (> 128 مدينة) والـ int64 masks (> 64)
+    needed = held_karp_memory_estimate(n)
+    if needed > max_memory:
+        raise MemoryError(
+            f"Held-Karp for {n} cities needs about {needed / 1024 ** 3:.2f} GiB "
+            f"(limit {max_memory / 1024 ** 3:.2f} GiB)"
+        )
+
+    # المدن غير مدينة البداية بتترقم 0..m-1 عشان الـ mask ميشيلش البداية
+    others = [c for c in range(n) if c != start_index]
+    m = len(others)
+    d = dist[np.ix_(others, others)].astype(np.float32)
+    from_start = dist[start_index, others].astype(np.float32)
+    to_start = dist[others, start_index]
+
+    order, bounds = _subsets_by_size(m)
+    shape = (1 << m, m)
+    blocks = []
+    if workers > 1:
+        blocks = [
+            shared_memory.SharedMemory(create=True, size=shape[0] * shape[1] * 4),
+            shared_memory.SharedMemory(create=True, size=shape[0] * shape[1]),
+            shared_memory.SharedMemory(create=True, size=order.nbytes),
+        ]
+        dp = np.ndarray(shape, dtype=np.float32, buffer=blocks[0].buf)
+        parent = np.ndarray(shape, dtype=np.int8, buffer=blocks[1].buf)
+        np.ndarray(order.shape, dtype=np.int64, buffer=blocks[2].buf)[:] = order
+    else:
+        dp = np.empty(shape, dtype=np.float32)
+        parent = np.empty(shape, dtype=np.int8)
+    try:
+        dp.fill(np.inf)
+        parent.fill(-1)
+        singles = 1 << np.arange(m)
+        dp[singles, np.arange(m)] = from_start
+
+        if workers > 1:
+            chunks = [list(range(m))[w::workers] for w in range(workers)]
+            with Pool(workers, initializer=_init_worker,
+                      initargs=([b.name for b in blocks], m, d)) as pool:
+                for size in range(2, m + 1):
+                    lo, hi = int(bounds[size]), int(bounds[size + 1])
+                    pool.map(_worker_task, [(lo, hi, js) for js in chunks])
+        else:
+            for size in range(2, m + 1):
+                _relax_layer(dp, parent, d, order[bounds[size]:bounds[size + 1]], range(m))
+
+        full = (1 << m) - 1
+        last = int(np.argmin(dp[full].astype(np.float64) + to_start))
+        path = []
+        mask = full
+        while last != -1:
+            path.append(others[last])
+            prev = int(parent[mask, last])
+            mask ^= 1 << last
+            last = prev
+    finally:
+        dp = parent = None
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    path = [start_index] + path[::-1] + [start_index]
+    # إعادة حساب التكلفة بـ float64 من المسار نفسه
+    return path, tour_length(path[:-1], dist)
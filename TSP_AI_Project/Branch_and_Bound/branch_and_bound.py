@@ -0,0 +1,213 @@
+import os
+import sys
+import time
+import random
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+from utils.geodesic import distance_matrix, tour_length
+from utils.stats import NO_STATS
+
+ROOT_ITERATIONS = 200   # subgradient steps for the root 1-tree
+NODE_ITERATIONS = 8     # extra steps per node, warm-started from the parent's penalties
+EPS = 1e-7
+
+
+def _mst(w):
+    # Prim O(k^2) على مصفوفة الأوزان؛ بيرجع التكلفة ودرجة كل node
+    k = len(w)
+    in_tree = np.zeros(k, dtype=bool)
+    in_tree[0] = True
+    key = w[0].copy()
+    key[0] = np.inf
+    parent = np.zeros(k, dtype=np.intp)
+    total = 0.0
+    for _ in range(k - 1):
+        j = int(np.argmin(key))
+        total += key[j]
+        in_tree[j] = True
+        key[j] = np.inf
+        better = (w[j] < key) & ~in_tree
+        key[better] = w[j][better]
+        parent[better] = j
+    degree = np.bincount(parent[1:], minlength=k)
+    degree[1:] += 1
+    return total, degree
+
+
+def _one_tree(w, special):
+    # MST على كل المدن غير special + أرخص وصلتين من special
+    others = np.array([i for i in range(len(w)) if i != special])
+    total, deg = _mst(w[np.ix_(others, others)])
+    degree = np.zeros(len(w), dtype=np.int64)
+    degree[others] = deg
+    nearest = others[np.argsort(w[special, others])[:2]]
+    total += w[special, nearest].sum()
+    degree[nearest] += 1
+    degree[special] = 2
+    return total, degree
+
+
+def _subgradient(bound_fn, pi, target, upper, iterations, step=2.0):
+    # Held-Karp ascent: pi += t * (degree - target), t = step * (UB - L) / |g|^2
+    best = -np.inf
+    best_pi = pi.copy()
+    stale = 0
+    for _ in range(iterations):
+        value, degree = bound_fn(pi)
+        lower = value - (target * pi).sum()
+        if lower > best + EPS:
+            best, best_pi, stale = lower, pi.copy(), 0
+        else:
+            stale += 1
+            if stale >= 3:
+                step *= 0.5
+                stale = 0
+        g = degree - target
+        norm = float((g * g).sum())
+        if norm == 0 or best >= upper - EPS:
+            break
+        pi = pi + step * (upper - lower) / norm * g
+    return best, best_pi
+
+
+def _initial_tour(d, start):
+    # nearest neighbour + 2-opt سريع عشان يبقى عندنا upper bound من الأول
+    n = len(d)
+    tour = [start]
+    left = set(range(n)) - {start}
+    while left:
+        row = d[tour[-1]]
+        nxt = min(left, key=lambda j: row[j])
+        tour.append(nxt)
+        left.remove(nxt)
+    t = np.array(tour)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(n - 2):
+            a, b = t[i], t[i + 1]
+            c = t[i + 2:]
+            e = np.append(t[i + 3:], t[0])
+            gain = d[a, b] + d[c, e] - d[a, c] - d[b, e]
+            j = int(np.argmax(gain))
+            if gain[j] > EPS:
+                t[i + 1:i + 3 + j] = t[i + 1:i + 3 + j][::-1]
+                improved = True
+    return [int(c) for c in t]
+
+
+# الوقت بيفرق جامد من instance للتانية مع نفس n (random_instance(n, seed)، Xeon بـ CPU واحد):
+# 30 مدينة 0.3-1.1 ث، 40: 32-66 ث، 45: 63-139 ث، 50: 4.8-106 ث، 60: 8.8-215 ث
+def branch_and_bound_tsp(dist_matrix, start_index=0, time_limit=None, stats=NO_STATS):
+    d = np.asarray(dist_matrix, dtype=np.float64)
+    n = len(d)
+    counters = {"nodes_expanded": 0, "nodes_pruned_bound": 0, "root_bound": 0.0, "optimal": True}
+    if n <= 3:
+        path = list(range(n))
+        path = path[start_index:] + path[:start_index]
+        stats.update(counters)
+        return path + [start_index], tour_length(path, d), counters
+
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    with stats.phase("initial_tour"):
+        best_tour = _initial_tour(d, start_index)
+    best = [tour_length(best_tour, d), best_tour]
+    stats.improved(best[0])
+
+    # الـ root: 1-tree bound على كل المدن؛ الـ penalties دي بتتورث لكل الـ nodes
+    target = np.full(n, 2.0)
+    with stats.phase("root_bound"):
+        root_bound, pi = _subgradient(
+            lambda p: _one_tree(d + p[:, None] + p[None, :], start_index),
+            np.zeros(n), target, best[0], ROOT_ITERATIONS)
+    counters["root_bound"] = float(root_bound)
+
+    def path_bound(current, remaining, pi, upper):
+        # أقل تكلفة لـ Hamiltonian path من current على remaining لحد start:
+        # spanning tree بدرجة 1 للطرفين و 2 للباقي، مع Lagrangian penalties
+        nodes = np.array([current] + remaining + [start_index])
+        sub = d[np.ix_(nodes, nodes)]
+        tgt = np.full(len(nodes), 2.0)
+        tgt[0] = tgt[-1] = 1.0
+        local = pi[nodes]
+        bound, local = _subgradient(
+            lambda p: _mst(sub + p[:, None] + p[None, :]),
+            local, tgt, upper, NODE_ITERATIONS, step=0.5)
+        child_pi = pi.copy()
+        child_pi[nodes] = local
+        return bound, child_pi
+    path_bound = stats.timed("bound", path_bound)
+
+    def search(path, remaining, cost, pi):
+        if deadline is not None and time.perf_counter() > deadline:
+            counters["optimal"] = False
+            return
+        counters["nodes_expanded"] += 1
+        current = path[-1]
+        if len(remaining) == 1:
+            last = remaining[0]
+            total = cost + d[current, last] + d[last, start_index]
+            if total < best[0] - EPS:
+                best[0], best[1] = total, path + [last]
+                stats.improved(total)
+            return
+
+        children = []
+        for nxt in remaining:
+            new_cost = cost + d[current, nxt]
+            rest = [c for c in remaining if c != nxt]
+            bound, child_pi = path_bound(nxt, rest, pi, best[0] - new_cost)
+            if new_cost + bound >= best[0] - EPS:
+                counters["nodes_pruned_bound"] += 1
+                continue
+            children.append((new_cost + bound, nxt, new_cost, rest, child_pi))
+
+        # الأقل bound الأول (depth-first)
+        children.sort(key=lambda c: c[0])
+        for bound, nxt, new_cost, rest, child_pi in children:
+            if bound >= best[0] - EPS:
+                counters["nodes_pruned_bound"] += 1
+                continue
+            search(path + [nxt], rest, new_cost, child_pi)
+
+    if root_bound < best[0] - EPS:
+        with stats.phase("search"):
+            search([start_index], [c for c in range(n) if c != start_index], 0.0, pi)
+
+    stats.update(counters)
+    tour = best[1]
+    return tour + [tour[0]], tour_length(tour, d), counters
+
+
+def main():
+    sys.path.insert(0, os.path.join(ROOT, "AI_Algorithm_A_Star_Search"))
+    from cities import group_5, group_15, group_20
+
+    print("=== TSP Solver using Branch and Bound (1-tree / Lagrangian bounds) ===")
+    n = int(input("Enter number of cities (5, 15, 20, or any size for random Egyptian cities): "))
+    groups = {5: group_5, 15: group_15, 20: group_20}
+    if n in groups:
+        names = list(groups[n].keys())
+        coords = list(groups[n].values())
+    else:
+        random.seed(42)
+        names = [f"City {i + 1}" for i in range(n)]
+        coords = [[random.uniform(22.0, 31.5), random.uniform(25.0, 35.0)] for _ in range(n)]
+
+    dist = distance_matrix(coords)
+    start_time = time.time()
+    path, cost, stats = branch_and_bound_tsp(dist, 0)
+    end_time = time.time()
+
+    print(f"Best Path: {' -> '.join(names[i] for i in path)}")
+    print(f"Total Distance: {cost:.2f} KM")
+    print(f"Root lower bound: {stats['root_bound']:.2f} KM")
+    print(f"Nodes expanded: {stats['nodes_expanded']}, pruned: {stats['nodes_pruned_bound']}")
+    print(f"Execution Time: {end_time - start_time:.5f} Seconds")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,20 @@
-# Genetic_Algorithm.py (النسخة المعدلة مع إضافة عنوان أنيق على الخريطة زي باقي الخوارزميات)
+# Genetic_Algorithm.py: GA بالـ NumPy؛ الـ population مصفوفة (pop_size, N) والـ fitness بتتحسب للجيل كله مرة واحدة،
+# والـ crossover / mutation batched من operators.py (ox / pmx / erx، swap / inversion)
 
-import math
+import os
+import sys
 import time
-import folium
-from folium.features import DivIcon
-from folium.plugins import PolyLineTextPath
-import random
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.geodesic import distance_matrix, tour_length
+from utils.lin_kernighan import lin_kernighan, lk_requested
+from utils.stats import NO_STATS
+from utils.visualization import LARGE_TOUR, headless, tour_map
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from operators import CROSSOVERS, MUTATIONS
 
 # =========================
 # Cities Groups
@@ -42,74 +51,111 @@ cities_20 = {
     "Damanhur": [31.03, 30.47]
 }
 
-# =========================
-# Distance Function
-# =========================
-
-def haversine(c1, c2):
-    R = 6371  # km
-    lat1, lon1 = map(math.radians, c1)
-    lat2, lon2 = map(math.radians, c2)
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-    a = math.sin(dlat/2)**2 + math.cos(lat1)*math.cos(lat2)*math.sin(dlon/2)**2
-    return R * (2 * math.asin(math.sqrt(a)))
-
-def distance_matrix(cities):
-    return [[haversine(cities[i], cities[j]) for j in range(len(cities))] for i in range(len(cities))]
-
 # =========================
 # Genetic Algorithm
 # =========================
 
-def create_population(size, N):
-    return [random.sample(range(N), N) for _ in range(size)]
-
-def fitness(tour, dist):
-    return sum(dist[tour[i]][tour[(i+1)%len(tour)]] for i in range(len(tour)))
-
-def selection(pop, dist):
-    return min(random.sample(pop, 5), key=lambda x: fitness(x, dist))
-
-def crossover(p1, p2):
-    size = len(p1)
-    a, b = sorted(random.sample(range(size), 2))
-    child = [-1]*size
-    child[a:b] = p1[a:b]
-    ptr = 0
-    for city in p2:
-        if city not in child:
-            while child[ptr] != -1:
-                ptr += 1
-            child[ptr] = city
-    return child
-
-def mutate(tour, rate=0.02):
-    if random.random() < rate:
-        i, j = random.sample(range(len(tour)), 2)
-        tour[i], tour[j] = tour[j], tour[i]
-    return tour
-
-def genetic_algorithm(dist, N):
+def greedy_tour(neighbors, rng, pick=2):
+    # nearest neighbour عشوائي على الـ candidate graph: واحد من أقرب pick مدن لسه متزارتش،
+    # ولو كل الـ candidates اتزاروا بنروح لأي مدينة عشوائية فاضلة
+    N = len(neighbors)
+    unvisited = list(range(N))
+    position = list(range(N))
+    tour = []
+    cur = int(rng.integers(N))
+    while True:
+        tour.append(cur)
+        i, last = position[cur], unvisited[-1]
+        unvisited[i], position[last] = last, i
+        unvisited.pop()
+        position[cur] = -1
+        if not unvisited:
+            return tour
+        options = [c for c in neighbors[cur] if position[c] >= 0][:pick]
+        if options:
+            cur = options[int(rng.integers(len(options)))]
+        else:
+            cur = unvisited[int(rng.integers(len(unvisited)))]
+
+def create_population(size, N, rng, neighbors=None, greedy_fraction=0.0):
+    # كل صف individual؛ مصفوفة (size, N) بدل list of lists
+    population = np.argsort(rng.random((size, N)), axis=1).astype(np.int32)
+    if neighbors is not None and greedy_fraction > 0:
+        # جزء من الـ population بيبدأ من tours greedy بدل random خالص
+        if hasattr(neighbors, "tolist"):
+            neighbors = neighbors.tolist()
+        for row in range(min(size, int(round(size * greedy_fraction)))):
+            population[row] = greedy_tour(neighbors, rng)
+    return population
+
+def population_fitness(population, dist):
+    # طول كل الـ tours مرة واحدة: gather لكل الوصلات من الـ matrix وبعدين sum على كل صف
+    return dist[population, np.roll(population, -1, axis=1)].sum(axis=1)
+
+def selection(fit, count, rng, k=5):
+    # tournament: k أفراد عشوائي لكل parent، والكسبان هو الأقل fitness (مجرد indexing في الـ vector)
+    contenders = rng.integers(0, len(fit), size=(count, k))
+    return contenders[np.arange(count), np.argmin(fit[contenders], axis=1)]
+
+def evolve(population, fit, dist, rng, generations, cross, mutate_all, mutation_rate=0.02, stats=NO_STATS):
+    # بيشغل generations جيل على population وبيرجع آخر جيل وأحسن tour اتشاف في الطريق
+    pop_size = len(population)
+    best_i = int(np.argmin(fit))
+    best, best_cost = population[best_i].tolist(), float(fit[best_i])
+    for _ in range(generations):
+        # الجيل كله مرة واحدة: index arrays للأبهات والـ operators بتشتغل على المصفوفة
+        parents = selection(fit, 2 * pop_size, rng)
+        children = cross(population[parents[0::2]], population[parents[1::2]], rng)
+        population = mutate_all(children, rng, mutation_rate)
+        # fitness بتتحسب مرة واحدة بس لكل جيل
+        fit = population_fitness(population, dist)
+        current = int(np.argmin(fit))
+        if fit[current] < best_cost:
+            best, best_cost = population[current].tolist(), float(fit[current])
+            stats.improved(best_cost)
+        stats.emit("generation", best_cost=best_cost, mean_cost=float(fit.mean()))
+    stats.add("iterations", generations)
+    return population, fit, best, best_cost
+
+def genetic_algorithm(dist, N, pop_size=120, generations=500, seed=None,
+                      crossover_type="ox", mutation_type="swap", mutation_rate=0.02, stats=NO_STATS,
+                      neighbors=None, greedy_fraction=0.0):
     start_time = time.time()  # بداية العد
-    population = create_population(120, N)
-    best = min(population, key=lambda x: fitness(x, dist))
-
-    for _ in range(500):
-        new_pop = [mutate(crossover(selection(population, dist), selection(population, dist))) for _ in range(120)]
-        population = new_pop
-        current = min(population, key=lambda x: fitness(x, dist))
-        if fitness(current, dist) < fitness(best, dist):
-            best = current
+    dist = np.asarray(dist, dtype=np.float64)
+    if N <= 2:
+        # مفيش غير tour واحد، والـ crossover/mutation محتاجين 3 مدن على الأقل
+        return list(range(N)), tour_length(list(range(N)), dist), time.time() - start_time
+    rng = np.random.default_rng(seed)
+
+    with stats.phase("init"):
+        population = create_population(pop_size, N, rng, neighbors, greedy_fraction)
+        fit = population_fitness(population, dist)
+    with stats.phase("evolve"):
+        _, _, best, best_cost = evolve(population, fit, dist, rng, generations,
+                                       CROSSOVERS[crossover_type], MUTATIONS[mutation_type], mutation_rate,
+                                       stats=stats)
 
     exec_time = time.time() - start_time  # نهاية العد
-    return best, fitness(best, dist), exec_time
+    return best, best_cost, exec_time
 
 # =========================
 # Visualization (معدلة لإضافة العنوان الأنيق)
 # =========================
 
 def visualize(cities, names, tour, filename, num_cities):
+    if headless():
+        return
+    if len(tour) > LARGE_TOUR:
+        # مع مدن كتير: خط واحد متبسط و circle markers على canvas بدل 2 marker لكل مدينة
+        tour_map(cities, tour, title=f"Genetic Algorithm (GA) - {num_cities} Cities",
+                 start_name=names[tour[0]]).save(filename)
+        print(f"\nMap saved as {filename}")
+        return
+
+    import folium
+    from folium.features import DivIcon
+    from folium.plugins import PolyLineTextPath
+
     m = folium.Map(location=cities[tour[0]], zoom_start=6)
 
     for i, idx in enumerate(tour):
@@ -193,4 +239,12 @@ if __name__ == "__main__":
     print(f"\nTotal Distance: {cost:.2f} km")
     print(f"Execution Time: {exec_time:.4f} seconds")
 
+    if lk_requested():
+        # LK اختياري (--lk)؛ من غيره الخريطة بتاعة الـ GA لوحده
+        lk_start = time.time()
+        best_tour = lin_kernighan(best_tour, dist)
+        print(f"After Lin-Kernighan post-optimization ({time.time() - lk_start:.4f} seconds): "
+              f"{tour_length(best_tour, dist):.2f} km")
+        print(" → ".join(names[i] for i in best_tour) + f" → {names[best_tour[0]]}")
+
     visualize(cities, names, best_tour, f"tsp_{choice}_cities.html", num_cities)
\ No newline at end of file
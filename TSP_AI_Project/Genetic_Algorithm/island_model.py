@@ -0,0 +1,120 @@
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from Genetic_Algorithm import create_population, evolve, population_fitness
+from operators import CROSSOVERS, MUTATIONS
+from utils.geodesic import tour_length
+from utils.stats import NO_STATS
+
+TOPOLOGIES = ("ring", "full")
+
+# worker-process state, filled once by _init_worker
+_shared = {}
+
+
+def _init_worker(dist, crossover_type, mutation_type, mutation_rate):
+    _shared["dist"] = dist
+    _shared["cross"] = CROSSOVERS[crossover_type]
+    _shared["mutate"] = MUTATIONS[mutation_type]
+    _shared["rate"] = mutation_rate
+
+
+def _run_epoch(args):
+    # island واحدة لـ interval جيل؛ حالة الـ rng بترجع مع الـ population عشان النتيجة متعتمدش على مين شغلها
+    population, rng_state, generations = args
+    rng = np.random.default_rng()
+    rng.bit_generator.state = rng_state
+    dist = _shared["dist"]
+    fit = population_fitness(population, dist)
+    population, fit, best, best_cost = evolve(population, fit, dist, rng, generations,
+                                              _shared["cross"], _shared["mutate"], _shared["rate"])
+    return population, fit, best, best_cost, rng.bit_generator.state
+
+
+def _migrate(islands, topology, migrants):
+    # أحسن migrants من كل island بيحلوا مكان الأسوأ في اللي بتستقبل منها
+    k = len(islands)
+    emigrants = []
+    for population, fit in islands:
+        order = np.argsort(fit)
+        emigrants.append((population[order[:migrants]], fit[order[:migrants]]))
+
+    for i, (population, fit) in enumerate(islands):
+        if topology == "ring":
+            sources = [(i - 1) % k]
+        else:
+            sources = [j for j in range(k) if j != i]
+        incoming = np.concatenate([emigrants[j][0] for j in sources])
+        incoming_fit = np.concatenate([emigrants[j][1] for j in sources])
+        worst = np.argsort(fit)[::-1][:len(incoming)]
+        population[worst] = incoming[:len(worst)]
+        fit[worst] = incoming_fit[:len(worst)]
+
+
+def island_model_ga(dist, N, islands=4, pop_size=120, generations=500, migration_interval=25,
+                    migrants=2, topology="ring", workers=None, seed=None,
+                    crossover_type="ox", mutation_type="swap", mutation_rate=0.02, stats=NO_STATS,
+                    neighbors=None, greedy_fraction=0.0):
+    """Independent GA populations that swap their best tours every migration_interval generations.
+
+    Each island has its own Generator spawned from seed, and its state travels with the
+    island between epochs, so the result is the same for any number of workers.
+    """
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"unknown topology {topology!r}, expected one of {TOPOLOGIES}")
+    start_time = time.time()
+    dist = np.asarray(dist, dtype=np.float64)
+    if N <= 2:
+        # نفس genetic_algorithm: tour واحد بس ممكن
+        return list(range(N)), tour_length(list(range(N)), dist), time.time() - start_time
+    if workers is None:
+        workers = min(islands, os.cpu_count() or 1)
+
+    rngs = [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(islands)]
+    populations = [create_population(pop_size, N, rng, neighbors, greedy_fraction) for rng in rngs]
+    states = [rng.bit_generator.state for rng in rngs]
+    # أحسن tour في الـ populations الأولى، زي evolve؛ كده generations=0 بيرجع tour برضه
+    best, best_cost = None, float("inf")
+    for population in populations:
+        fit = population_fitness(population, dist)
+        i = int(np.argmin(fit))
+        if fit[i] < best_cost:
+            best, best_cost = population[i].tolist(), float(fit[i])
+
+    initargs = (dist, crossover_type, mutation_type, mutation_rate)
+    pool = Pool(workers, initializer=_init_worker, initargs=initargs) if workers > 1 else None
+    if pool is None:
+        _init_worker(*initargs)
+    try:
+        done = 0
+        while done < generations:
+            step = min(migration_interval, generations - done)
+            tasks = [(population, state, step) for population, state in zip(populations, states)]
+            results = pool.map(_run_epoch, tasks) if pool else [_run_epoch(t) for t in tasks]
+            done += step
+
+            pairs = []
+            populations, states = [], []
+            for population, fit, island_best, island_cost, state in results:
+                if island_cost < best_cost:
+                    best, best_cost = island_best, island_cost
+                    stats.improved(best_cost)
+                pairs.append((population, fit))
+                populations.append(population)
+                states.append(state)
+            stats.emit("epoch", generations=done, best_cost=best_cost)
+            if done < generations and islands > 1 and migrants > 0:
+                _migrate(pairs, topology, migrants)
+                stats.add("migrations")
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    stats.add("iterations", generations)
+    return best, best_cost, time.time() - start_time
@@ -0,0 +1,156 @@
+import random
+
+import numpy as np
+
+# =========================
+# Single-child operators, O(n) each
+# =========================
+
+def order_crossover(p1, p2, a, b):
+    # OX: p1[a:b] يتنقل زي ما هو، والباقي بيتملى من p2 بالترتيب
+    # placed mask بدل "city not in child" اللي كانت O(n^2)
+    placed = bytearray(len(p1))
+    for city in p1[a:b]:
+        placed[city] = 1
+    rest = [city for city in p2 if not placed[city]]
+    return rest[:a] + list(p1[a:b]) + rest[a:]
+
+
+def pmx(p1, p2, a, b):
+    # PMX: p1[a:b] ثابت، وكل مدينة من p2 برا الـ segment بتتبع الـ mapping لحد ما تطلع برا الـ segment
+    size = len(p1)
+    child = list(p2)
+    child[a:b] = p1[a:b]
+    in_segment = bytearray(size)
+    mapping = [0] * size
+    for i in range(a, b):
+        in_segment[p1[i]] = 1
+        mapping[p1[i]] = p2[i]
+    for i in list(range(a)) + list(range(b, size)):
+        city = p2[i]
+        while in_segment[city]:
+            city = mapping[city]
+        child[i] = city
+    return child
+
+
+def edge_recombination(p1, p2, rand=random):
+    # ERX: كل مدينة ليها جيرانها في الأبين، وبنختار الجار اللي عنده أقل جيران فاضلين
+    size = len(p1)
+    edges = [set() for _ in range(size)]
+    for parent in (p1, p2):
+        prev = parent[-1]
+        for city in parent:
+            edges[prev].add(city)
+            edges[city].add(prev)
+            prev = city
+
+    placed = bytearray(size)
+    cursor = 0  # لو مفيش جيران فاضلين بناخد أول مدينة مش متحطة في p1 (amortized O(n))
+    city = p1[0]
+    child = [city]
+    while len(child) < size:
+        placed[city] = 1
+        options = edges[city]
+        for other in options:
+            edges[other].discard(city)
+        if options:
+            fewest = 5
+            ties = []
+            for c in options:
+                k = len(edges[c])
+                if k < fewest:
+                    fewest, ties = k, [c]
+                elif k == fewest:
+                    ties.append(c)
+            city = ties[0] if len(ties) == 1 else ties[int(rand.random() * len(ties))]
+        else:
+            while placed[p1[cursor]]:
+                cursor += 1
+            city = p1[cursor]
+        child.append(city)
+    return child
+
+# =========================
+# Batched operators: a whole generation from index arrays
+# =========================
+
+def random_cuts(count, N, rng):
+    # نقطتين قطع مختلفتين (a < b) لكل child
+    a = rng.integers(0, N, size=count)
+    b = rng.integers(0, N - 1, size=count)
+    b += b >= a
+    return np.minimum(a, b), np.maximum(a, b)
+
+
+def _segment_mask(count, N, a, b):
+    cols = np.arange(N)
+    return (cols >= a[:, None]) & (cols < b[:, None])
+
+
+def ox_batch(P1, P2, rng):
+    count, N = P1.shape
+    a, b = random_cuts(count, N, rng)
+    rows = np.arange(count)[:, None]
+    segment = _segment_mask(count, N, a, b)
+    placed = np.zeros((count, N), dtype=bool)
+    placed[np.broadcast_to(rows, P1.shape)[segment], P1[segment]] = True
+    # stable sort على placed: مدن p2 اللي مش في الـ segment الأول وبنفس ترتيبها
+    rest = P2[rows, np.argsort(placed[rows, P2], axis=1, kind="stable")]
+    cols = np.arange(N)
+    take = np.where(cols < a[:, None], cols, cols - (b - a)[:, None])
+    return np.where(segment, P1, rest[rows, np.clip(take, 0, N - 1)])
+
+
+def pmx_batch(P1, P2, rng):
+    count, N = P1.shape
+    a, b = random_cuts(count, N, rng)
+    rows = np.arange(count)[:, None]
+    segment = _segment_mask(count, N, a, b)
+    full_rows = np.broadcast_to(rows, P1.shape)
+    in_segment = np.zeros((count, N), dtype=bool)
+    in_segment[full_rows[segment], P1[segment]] = True
+    mapping = np.zeros((count, N), dtype=P1.dtype)
+    mapping[full_rows[segment], P1[segment]] = P2[segment]
+
+    child = np.where(segment, P1, P2)
+    # كل خطوة بتطبق الـ mapping مرة على كل المدن اللي لسه جوه الـ segment؛ أقصى b-a خطوة
+    while True:
+        clash = ~segment & in_segment[rows, child]
+        if not clash.any():
+            return child
+        child = np.where(clash, mapping[rows, child], child)
+
+
+def erx_batch(P1, P2, rng):
+    rand = random.Random(int(rng.integers(2 ** 63)))
+    return np.array([edge_recombination(p1, p2, rand) for p1, p2 in zip(P1.tolist(), P2.tolist())],
+                    dtype=P1.dtype)
+
+
+CROSSOVERS = {"ox": ox_batch, "pmx": pmx_batch, "erx": erx_batch}
+
+
+def swap_mutation(population, rng, rate=0.02):
+    # كل صف بيتبدل فيه مدينتين باحتمال rate
+    rows = np.flatnonzero(rng.random(len(population)) < rate)
+    i, j = random_cuts(len(rows), population.shape[1], rng)
+    population[rows, i], population[rows, j] = population[rows, j], population[rows, i]
+    return population
+
+
+def inversion_mutation(population, rng, rate=0.02):
+    # بيقلب segment عشوائي (نفس حركة 2-opt) في الصفوف المختارة
+    rows = np.flatnonzero(rng.random(len(population)) < rate)
+    if len(rows) == 0:
+        return population
+    N = population.shape[1]
+    a, b = random_cuts(len(rows), N, rng)
+    cols = np.arange(N)
+    inside = (cols >= a[:, None]) & (cols <= b[:, None])
+    src = np.where(inside, (a + b)[:, None] - cols, cols)
+    population[rows] = population[rows[:, None], src]
+    return population
+
+
+MUTATIONS = {"swap": swap_mutation, "inversion": inversion_mutation}
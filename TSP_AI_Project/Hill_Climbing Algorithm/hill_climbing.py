@@ -0,0 +1,232 @@
+import os
+import random
+import sys
+import time
+from functools import partial
+from multiprocessing import Pool
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.stats import NO_STATS, SolverStats
+
+# الكود المشترك بين سكريبتات الـ Hill Climbing (5 / 15 / 20 / user input)
+
+
+def total_distance(route, dist):
+    return sum(dist[route[i]][route[(i+1)%len(route)]] for i in range(len(route)))
+
+
+def swap_delta(route, dist, i, j):
+    # التغيير في الطول لو بدلنا route[i] و route[j] (i < j): بس الوصلات اللي حوالين الاتنين، O(1)
+    n = len(route)
+    a, b = route[i], route[j]
+    p, q = route[i - 1], route[(j + 1) % n]
+    if j == i + 1:
+        return dist[p][b] + dist[a][q] - dist[p][a] - dist[b][q]
+    if i == 0 and j == n - 1:
+        # b قبل a مباشرة في الدايرة
+        p, q = route[j - 1], route[1]
+        return dist[p][a] + dist[b][q] - dist[p][b] - dist[a][q]
+    na, pb = route[i + 1], route[j - 1]
+    return (dist[p][b] + dist[b][na] + dist[pb][a] + dist[a][q]
+            - dist[p][a] - dist[a][na] - dist[pb][b] - dist[b][q])
+
+
+def two_opt_delta(route, dist, i, j):
+    # عكس route[i+1..j]: بنشيل (i, i+1) و (j, j+1) ونحط (i, j) و (i+1, j+1)
+    n = len(route)
+    a, b = route[i], route[i + 1]
+    c, e = route[j], route[(j + 1) % n]
+    return dist[a][c] + dist[b][e] - dist[a][b] - dist[c][e]
+
+
+def _scan_swap(route, dist, best_delta, first_improvement):
+    best_move = None
+    n = len(route)
+    for i in range(n):
+        for j in range(i + 1, n):
+            delta = swap_delta(route, dist, i, j)
+            if delta < best_delta:
+                best_move, best_delta = ("swap", i, j), delta
+                if first_improvement:
+                    return best_move, best_delta
+    return best_move, best_delta
+
+
+def _scan_two_opt(route, dist, best_delta, first_improvement):
+    # نفس two_opt_delta بس inline عشان ده أسخن loop في الملف
+    best_move = None
+    n = len(route)
+    nxt = route[1:] + route[:1]
+    for i in range(n - 1):
+        a, b = route[i], route[i + 1]
+        row_a, row_b = dist[a], dist[b]
+        removed = row_a[b]
+        # j = n-1 مع i = 0 بيعكس كل حاجة غير route[0] = نفس الدايرة
+        for j in range(i + 2, n if i else n - 1):
+            c, e = route[j], nxt[j]
+            delta = row_a[c] + row_b[e] - removed - dist[c][e]
+            if delta < best_delta:
+                best_move, best_delta = ("2opt", i, j), delta
+                if first_improvement:
+                    return best_move, best_delta
+    return best_move, best_delta
+
+
+def _scan_swap_candidates(route, dist, best_delta, first_improvement, neighbors, pos):
+    # بس swaps بتجيب جار من الـ candidate list لـ route[i] جنبه (مكان i+1 أو i-1): O(n*k) بدل O(n^2)
+    best_move = None
+    n = len(route)
+    for i in range(n):
+        for c in neighbors[route[i]]:
+            j = pos[c]
+            for t in ((i + 1) % n, i - 1 if i else n - 1):
+                if t == j:
+                    continue
+                lo, hi = (t, j) if t < j else (j, t)
+                delta = swap_delta(route, dist, lo, hi)
+                if delta < best_delta:
+                    best_move, best_delta = ("swap", lo, hi), delta
+                    if first_improvement:
+                        return best_move, best_delta
+    return best_move, best_delta
+
+
+def _scan_two_opt_candidates(route, dist, best_delta, first_improvement, neighbors, pos):
+    # الوصلة الجديدة (a, c) لازم تكون أقصر من وصلة هنشيلها من عند a، فأول ما d(a, c) تعدي الاتنين نقف
+    best_move = None
+    n = len(route)
+    for i in range(n):
+        a = route[i]
+        row_a = dist[a]
+        d_next, d_prev = row_a[route[(i + 1) % n]], row_a[route[i - 1]]
+        for c in neighbors[a]:
+            d_ac = row_a[c]
+            if d_ac >= d_next and d_ac >= d_prev:
+                break
+            j = pos[c]
+            # succ: نشيل (a, a+1) و (c, c+1)؛ pred: نشيل (a-1, a) و (c-1, c)
+            for x, y, useful in ((i, j, d_ac < d_next), ((i - 1) % n, (j - 1) % n, d_ac < d_prev)):
+                if not useful:
+                    continue
+                lo, hi = (x, y) if x < y else (y, x)
+                if hi - lo < 2 or (lo == 0 and hi == n - 1):
+                    continue
+                delta = two_opt_delta(route, dist, lo, hi)
+                if delta < best_delta:
+                    best_move, best_delta = ("2opt", lo, hi), delta
+                    if first_improvement:
+                        return best_move, best_delta
+    return best_move, best_delta
+
+
+def apply_move(route, move, i, j):
+    if move == "swap":
+        route[i], route[j] = route[j], route[i]
+    else:
+        route[i + 1:j + 1] = route[i + 1:j + 1][::-1]
+
+
+NEIGHBOURHOODS = ("swap", "2opt", "both")
+
+
+def hill_climbing(dist, rng=random, neighbourhood="swap", first_improvement=False, stats=NO_STATS,
+                  neighbors=None):
+    # كل neighbour بيتقيم بـ delta O(1) من الـ matrix بدل نسخ الـ route وحساب total_distance من الأول
+    # ولو فيه neighbors (candidate graph) بنجرب بس الـ moves اللي بتعمل وصلة لجار قريب
+    if neighbourhood not in NEIGHBOURHOODS:
+        raise ValueError(f"unknown neighbourhood {neighbourhood!r}, expected one of {NEIGHBOURHOODS}")
+    if hasattr(dist, "tolist"):
+        dist = dist.tolist()
+    n = len(dist)
+    current_route = list(range(n))
+    rng.shuffle(current_route)
+    if n < 4:
+        return current_route, total_distance(current_route, dist)
+    scans = {"swap": [_scan_swap], "2opt": [_scan_two_opt], "both": [_scan_swap, _scan_two_opt]}[neighbourhood]
+    pos = None
+    if neighbors is not None:
+        if hasattr(neighbors, "tolist"):
+            neighbors = neighbors.tolist()
+        pos = [0] * n
+        restricted = {_scan_swap: _scan_swap_candidates, _scan_two_opt: _scan_two_opt_candidates}
+        scans = [partial(restricted[scan], neighbors=neighbors, pos=pos) for scan in scans]
+    steps = 0
+    while True:
+        best_move, best_delta = None, -1e-9
+        if pos is not None:
+            for idx, city in enumerate(current_route):
+                pos[city] = idx
+        for scan in scans:
+            move, best_delta = scan(current_route, dist, best_delta, first_improvement)
+            if move is not None:
+                best_move = move
+                if first_improvement:
+                    break
+        if best_move is None: break
+        apply_move(current_route, *best_move)
+        steps += 1
+    stats.add("iterations", steps)
+    return current_route, total_distance(current_route, dist)
+
+
+def restart_rng(seed, restart):
+    # seed لكل restart متشتق من (seed, رقم الـ restart)، فالنتيجة مش بتفرق مع عدد الـ workers
+    return random.Random(f"{seed}:{restart}")
+
+
+# worker-process state, filled once by _init_worker
+_shared = {}
+
+
+def _init_worker(dist, seed, options):
+    _shared["dist"] = dist
+    _shared["seed"] = seed
+    _shared["options"] = options
+
+
+def _run_restart(restart):
+    # الـ stats object مبيعديش للـ processes، فكل restart بترجع عدد الـ steps بتاعها
+    stats = SolverStats()
+    route, cost = hill_climbing(_shared["dist"], restart_rng(_shared["seed"], restart), stats=stats,
+                                **_shared["options"])
+    return route, cost, stats.counters.get("iterations", 0)
+
+
+def parallel_restarts(dist, restarts, seed=42, workers=None, target_cost=None, time_limit=None, stats=NO_STATS,
+                      **options):
+    """Best of `restarts` independent hill_climbing runs, spread over a process pool.
+
+    Results are consumed in restart order, so stopping at target_cost gives the same
+    answer for any worker count; time_limit stops at whatever has finished by then.
+    Extra keyword options (neighbourhood, first_improvement, neighbors) go to hill_climbing.
+    Returns (route, cost, restarts_done).
+    """
+    if workers is None:
+        workers = min(restarts, os.cpu_count() or 1)
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    best_route, best_cost = None, float('inf')
+    done = 0
+
+    pool = Pool(workers, initializer=_init_worker, initargs=(dist, seed, options)) if workers > 1 else None
+    if pool is None:
+        _init_worker(dist, seed, options)
+    try:
+        results = pool.imap(_run_restart, range(restarts)) if pool else map(_run_restart, range(restarts))
+        for route, cost, steps in results:
+            done += 1
+            stats.add("iterations", steps)
+            stats.emit("restart", restart=done - 1, cost=cost)
+            if cost < best_cost:
+                best_route, best_cost = route, cost
+                stats.improved(best_cost)
+            if target_cost is not None and best_cost <= target_cost:
+                break
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+    finally:
+        if pool is not None:
+            # terminate مش close: الـ restarts اللي لسه شغالة ملهاش لازمة بعد الـ early stop
+            pool.terminate()
+            pool.join()
+    stats.add("restarts", done)
+    return best_route, best_cost, done
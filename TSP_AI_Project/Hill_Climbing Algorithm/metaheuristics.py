@@ -0,0 +1,187 @@
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from hill_climbing import apply_move, swap_delta, total_distance, two_opt_delta
+from utils.stats import NO_STATS
+
+# Simulated annealing و tabu search على نفس الـ moves والـ deltas بتاعة hill_climbing.py
+
+SCHEDULES = ("geometric", "linear", "logarithmic")
+CHECK_EVERY = 128  # كل كام iteration نبص على الساعة
+
+
+def _start(dist, rng, initial):
+    if hasattr(dist, "tolist"):
+        dist = dist.tolist()
+    route = list(initial) if initial is not None else rng.sample(range(len(dist)), len(dist))
+    return dist, route
+
+
+def _check_budget(time_limit, max_iterations):
+    # من غير الاتنين الـ loop ملهاش نهاية
+    if time_limit is None and max_iterations is None:
+        raise ValueError("time_limit and max_iterations cannot both be None")
+
+
+def _random_move(n, rng, neighbourhood):
+    i, j = sorted(rng.sample(range(n), 2))
+    if neighbourhood == "both":
+        return ("swap" if rng.random() < 0.5 else "2opt"), i, j
+    return neighbourhood, i, j
+
+
+def _initial_temperature(route, dist, rng, neighbourhood, accept=0.8, samples=200):
+    # T0 بحيث move أسوأ بمتوسط الـ uphill deltas يتقبل باحتمال accept تقريباً
+    delta_of = {"swap": swap_delta, "2opt": two_opt_delta}
+    uphill = []
+    for _ in range(samples):
+        move, i, j = _random_move(len(route), rng, neighbourhood)
+        delta = delta_of[move](route, dist, i, j)
+        if delta > 0:
+            uphill.append(delta)
+    if not uphill:
+        return 1.0
+    return -(sum(uphill) / len(uphill)) / math.log(accept)
+
+
+def _temperature(schedule, t0, t_end, progress):
+    if schedule == "geometric":
+        return t0 * (t_end / t0) ** progress
+    if schedule == "linear":
+        return t0 + (t_end - t0) * progress
+    # logarithmic: بيبرد بسرعة الأول وبعدين ببطء
+    return t_end + (t0 - t_end) * (1 - math.log1p(progress * (math.e - 1)))
+
+
+def simulated_annealing(dist, rng=random, time_limit=1.0, max_iterations=None, schedule="geometric",
+                        neighbourhood="both", t_end_ratio=1e-3, reheat_after=None, reheat_ratio=0.5,
+                        initial=None, stats=NO_STATS):
+    """Simulated annealing with O(1) move deltas and a wall-clock budget.
+
+    The temperature follows `schedule` from T0 down to T0 * t_end_ratio over the budget
+    (time_limit seconds, or max_iterations if given). With reheat_after, the temperature
+    jumps back to reheat_ratio * T0 after that many iterations without a new best tour and
+    the schedule restarts over the remaining budget.
+    """
+    _check_budget(time_limit, max_iterations)
+    if schedule not in SCHEDULES:
+        raise ValueError(f"unknown schedule {schedule!r}, expected one of {SCHEDULES}")
+    dist, route = _start(dist, rng, initial)
+    n = len(route)
+    if n < 4:
+        return route, total_distance(route, dist)
+
+    delta_of = {"swap": swap_delta, "2opt": two_opt_delta}
+    t0 = _initial_temperature(route, dist, rng, neighbourhood)
+    t_end = t0 * t_end_ratio
+    cost = total_distance(route, dist)
+    best_route, best_cost = route[:], cost
+
+    start = time.perf_counter()
+    progress = 0.0
+    # بعد كل reheat الـ schedule بيبدأ من أول تاني من t_hot على الوقت اللي فاضل
+    t_hot, reheat_at = t0, 0.0
+    temperature = t0
+    iteration = since_best = accepted = reheats = 0
+    while True:
+        if iteration % CHECK_EVERY == 0:
+            if max_iterations is not None:
+                progress = iteration / max_iterations
+            else:
+                progress = (time.perf_counter() - start) / time_limit
+            if progress >= 1.0:
+                break
+            temperature = _temperature(schedule, t_hot, t_end, (progress - reheat_at) / (1.0 - reheat_at))
+        iteration += 1
+
+        move, i, j = _random_move(n, rng, neighbourhood)
+        delta = delta_of[move](route, dist, i, j)
+        if delta <= 0 or rng.random() < math.exp(-delta / temperature):
+            apply_move(route, move, i, j)
+            cost += delta
+            accepted += 1
+            if cost < best_cost - 1e-9:
+                best_route, best_cost = route[:], cost
+                stats.improved(best_cost)
+                since_best = 0
+                continue
+        since_best += 1
+        if reheat_after is not None and since_best >= reheat_after:
+            t_hot, reheat_at = max(reheat_ratio * t0, t_end), progress
+            temperature = t_hot
+            since_best = 0
+            reheats += 1
+
+    stats.update({"iterations": iteration, "accepted": accepted, "reheats": reheats,
+                  "initial_temperature": t0})
+    return best_route, total_distance(best_route, dist)
+
+
+def tabu_search(dist, rng=random, time_limit=1.0, max_iterations=None, tenure=None, initial=None, stats=NO_STATS):
+    """Tabu search over the 2-opt neighbourhood.
+
+    Every iteration takes the best non-tabu 2-opt move, even if it makes the tour worse.
+    Edges removed by a move may not be added back for `tenure` iterations unless the move
+    gives a new best tour (aspiration).
+    """
+    _check_budget(time_limit, max_iterations)
+    dist, route = _start(dist, rng, initial)
+    n = len(route)
+    if n < 5:
+        return route, total_distance(route, dist)
+    if tenure is None:
+        tenure = max(5, n // 4)
+
+    cost = total_distance(route, dist)
+    best_route, best_cost = route[:], cost
+    tabu = {}  # edge (a, b) مع a < b -> آخر iteration ممنوع فيها ترجع
+    start = time.perf_counter()
+    iteration = tabu_blocked = tabu_resets = 0
+    while True:
+        if max_iterations is not None:
+            if iteration >= max_iterations:
+                break
+        elif time.perf_counter() - start >= time_limit:
+            break
+        iteration += 1
+
+        nxt = route[1:] + route[:1]
+        chosen, chosen_delta = None, math.inf
+        for i in range(n - 1):
+            a, b = route[i], route[i + 1]
+            row_a, row_b = dist[a], dist[b]
+            removed = row_a[b]
+            for j in range(i + 2, n if i else n - 1):
+                c, e = route[j], nxt[j]
+                delta = row_a[c] + row_b[e] - removed - dist[c][e]
+                if delta >= chosen_delta:
+                    continue
+                # الـ move بتضيف (a, c) و (b, e)؛ ممنوعة لو واحدة منهم tabu إلا لو هتدي best جديد
+                if (tabu.get((min(a, c), max(a, c)), 0) >= iteration
+                        or tabu.get((min(b, e), max(b, e)), 0) >= iteration):
+                    if cost + delta >= best_cost - 1e-9:
+                        tabu_blocked += 1
+                        continue
+                chosen, chosen_delta = (i, j), delta
+        if chosen is None:
+            # كل الـ moves tabu (بيحصل مع مدن قليلة): نفضي الـ list ونكمل
+            tabu.clear()
+            tabu_resets += 1
+            continue
+
+        i, j = chosen
+        a, b, c, e = route[i], route[i + 1], route[j], nxt[j]
+        tabu[(min(a, b), max(a, b))] = iteration + tenure
+        tabu[(min(c, e), max(c, e))] = iteration + tenure
+        apply_move(route, "2opt", i, j)
+        cost += chosen_delta
+        if cost < best_cost - 1e-9:
+            best_route, best_cost = route[:], cost
+            stats.improved(best_cost)
+
+    stats.update({"iterations": iteration, "moves_blocked_tabu": tabu_blocked, "tabu_resets": tabu_resets})
+    return best_route, total_distance(best_route, dist)
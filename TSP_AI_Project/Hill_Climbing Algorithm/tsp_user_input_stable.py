@@ -1,58 +1,71 @@
-import random, math, folium, webbrowser, os, time
-random.seed(42)
+import os, sys, time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.geodesic import distance_matrix, tour_length
+from utils.lin_kernighan import lin_kernighan, lk_requested
+from utils.instances import euc_2d_matrix, load_instance
+from utils.visualization import LARGE_TOUR, headless, open_in_browser, tour_map
+from hill_climbing import parallel_restarts
+from metaheuristics import simulated_annealing, tabu_search
+import random
 
-def haversine(c1, c2):
-    R = 6371
-    lat1, lon1, lat2, lon2 = map(math.radians, [c1[0], c1[1], c2[0], c2[1]])
-    dlat, dlon = lat2 - lat1, lon2 - lon1
-    a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-    return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
+if __name__ == "__main__":
+    print("--- TSP User Configuration ---")
+    answer = input("Enter number of cities (or a TSPLIB .tsp / .csv file path): ").strip()
+    names, coords, dist, metric = [], [], None, "geo"
+    if answer.isdigit():
+        for i in range(int(answer)):
+            name = input(f"City {i+1} Name: ")
+            lat = float(input(f"  Lat: "))
+            lon = float(input(f"  Lon: "))
+            names.append(name)
+            coords.append([lat, lon])
+    else:
+        # ملف كامل بدل ما ندخل كل مدينة لوحدها
+        instance = load_instance(answer)
+        metric, dist = instance["metric"], instance["dist"]
+        coords = instance["coords"].tolist() if instance["coords"] is not None else None
+        n = len(coords) if coords is not None else len(dist)
+        names = instance["names"] or [f"City {i+1}" for i in range(n)]
+    mode = input("Search mode (1 = Random Restarts, 2 = Simulated Annealing, 3 = Tabu Search) [1]: ").strip() or "1"
+    # الـ restarts بتاعة الـ hill climbing بس، و SA / tabu بياخدوا time budget
+    if mode == "1":
+        restarts = int(input("Enter Random Restarts: "))
+    else:
+        budget = float(input("Time budget in seconds [2]: ").strip() or 2)
 
-def total_distance(route, coords):
-    return sum(haversine(coords[route[i]], coords[route[(i+1)%len(route)]]) for i in range(len(route)))
+    if dist is None:
+        dist = euc_2d_matrix(coords) if metric == "euc_2d" else distance_matrix(coords)
+    dist = dist.tolist()
+    start_t = time.time()
+    if mode == "2":
+        best_route, best_dist = simulated_annealing(dist, random.Random(42), time_limit=budget)
+    elif mode == "3":
+        best_route, best_dist = tabu_search(dist, random.Random(42), time_limit=budget)
+    else:
+        # الـ restarts بتتوزع على process pool، وكل restart ليه seed متشتق من 42
+        best_route, best_dist, _ = parallel_restarts(dist, restarts, seed=42)
+    end_t = time.time()
 
-def hill_climbing(coords):
-    n = len(coords)
-    current_route = list(range(n))
-    random.shuffle(current_route)
-    current_cost = total_distance(current_route, coords)
-    while True:
-        best_neighbor, best_cost = current_route, current_cost
-        for i in range(n):
-            for j in range(i + 1, n):
-                neighbor = current_route[:]
-                neighbor[i], neighbor[j] = neighbor[j], neighbor[i]
-                cost = total_distance(neighbor, coords)
-                if cost < best_cost: best_neighbor, best_cost = neighbor, cost
-        if best_cost >= current_cost: break
-        current_route, current_cost = best_neighbor, best_cost
-    return current_route, current_cost
+    print("\n" + "="*45 + f"\nExecution Time: {end_t - start_t:.6f} sec\nBest Distance: {best_dist:.2f} km\nPath: {' -> '.join([names[i] for i in best_route])} -> {names[best_route[0]]}\n" + "="*45)
+    if lk_requested():
+        # LK اختياري (--lk)؛ من غيره الـ path والخريطة والوقت بتوع الـ hill climbing لوحده
+        lk_start = time.time()
+        best_route = lin_kernighan(best_route, dist)
+        print(f"After Lin-Kernighan post-optimization ({time.time() - lk_start:.6f} sec): "
+              f"{tour_length(best_route, dist):.2f} km\nPath: {' -> '.join([names[i] for i in best_route])} -> {names[best_route[0]]}")
 
-print("--- TSP User Configuration ---")
-n = int(input("Enter number of cities: "))
-restarts = int(input("Enter Random Restarts: "))
-names, coords = [], []
-for i in range(n):
-    name = input(f"City {i+1} Name: ")
-    lat = float(input(f"  Lat: "))
-    lon = float(input(f"  Lon: "))
-    names.append(name)
-    coords.append([lat, lon])
-
-start_t = time.time()
-best_route, best_dist = None, float('inf')
-for _ in range(restarts):
-    r, c = hill_climbing(coords)
-    if c < best_dist: best_route, best_dist = r, c
-end_t = time.time()
-
-print("\n" + "="*45 + f"\nExecution Time: {end_t - start_t:.6f} sec\nBest Distance: {best_dist:.2f} km\nPath: {' -> '.join([names[i] for i in best_route])} -> {names[best_route[0]]}\n" + "="*45)
-
-m = folium.Map(location=coords[best_route[0]], zoom_start=5)
-for i, idx in enumerate(best_route):
-    color = 'green' if i == 0 else 'red'
-    folium.Marker(coords[idx], popup=f"{i+1}: {names[idx]}", icon=folium.Icon(color=color)).add_to(m)
-folium.PolyLine([coords[i] for i in best_route] + [coords[best_route[0]]], color="blue", weight=4).add_to(m)
-fname = "user_map.html"
-m.save(fname)
-webbrowser.open("file://" + os.path.realpath(fname))
\ No newline at end of file
+    # الخريطة بس لو عندنا lat/lon
+    if metric == "geo" and coords is not None and not headless():
+        import folium
+        if len(best_route) > LARGE_TOUR:
+            m = tour_map(coords, best_route, title=f"Hill Climbing - {len(best_route)} Cities",
+                         start_name=names[best_route[0]])
+        else:
+            m = folium.Map(location=coords[best_route[0]], zoom_start=5)
+            for i, idx in enumerate(best_route):
+                color = 'green' if i == 0 else 'red'
+                folium.Marker(coords[idx], popup=f"{i+1}: {names[idx]}", icon=folium.Icon(color=color)).add_to(m)
+            folium.PolyLine([coords[i] for i in best_route] + [coords[best_route[0]]], color="blue", weight=4).add_to(m)
+        fname = "user_map.html"
+        m.save(fname)
+        open_in_browser(fname)
@@ -1,89 +1,314 @@
-import math
+import os
+import sys
 import random
 import time
-import folium
-from folium.plugins import PolyLineTextPath
-from typing import List, Tuple
+from collections import deque
 
-City = Tuple[float, float]
-Tour = List[int]
-
-def haversine(a: City, b: City) -> float:
-    R = 6371  
+import numpy as np
+from typing import List, Optional, Tuple
 
-    lat1, lon1 = map(math.radians, a)
-    lat2, lon2 = map(math.radians, b)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.candidates import nearest_neighbors
+from utils.geodesic import as_distance, distance_matrix, tour_length
+from utils.lin_kernighan import lin_kernighan
+from utils.spatial import SphereGrid
+from utils.stats import NO_STATS
+from utils.tour import move_segment, positions, reverse_segment
+from utils.visualization import LARGE_TOUR, headless, tour_map
 
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-
-    h = math.sin(dlat / 2) ** 2 + \
-        math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+City = Tuple[float, float]
+Tour = List[int]
+Matrix = np.ndarray
+
+def nearest_neighbor_random(dist: Optional[Matrix], k: int = 3, coords: Optional[List[City]] = None,
+                            neighbors=None) -> Tour:
+    # مع coords بنستخدم spatial index (مش محتاجين matrix خالص)، غير كده بنختار أقرب k من صف الـ matrix
+    # ومع neighbors (candidate graph) صف الـ matrix بيتبص عليه بس لما كل الـ candidates تكون اتزارت
+    n = len(coords) if coords is not None else len(dist)
+    start = random.randrange(n)
+    tour = [start]
 
-    return 2 * R * math.atan2(math.sqrt(h), math.sqrt(1 - h))
+    if coords is not None:
+        grid = SphereGrid(coords)
+        grid.remove(start)
+        while len(grid):
+            next_city = random.choice(grid.nearest(tour[-1], k))
+            grid.remove(next_city)
+            tour.append(next_city)
+        return tour
+
+    d = np.asarray(dist)
+    unvisited = np.array([c for c in range(n) if c != start])
+    if neighbors is not None:
+        return _nearest_neighbor_on_graph(d, tour, unvisited, k, neighbors)
+    while len(unvisited):
+        row = d[tour[-1], unvisited]
+        kk = min(k, len(unvisited))
+        candidates = np.argpartition(row, kk - 1)[:kk] if kk < len(unvisited) else np.arange(len(unvisited))
+        pick = int(random.choice(candidates.tolist()))
+        tour.append(int(unvisited[pick]))
+        unvisited[pick] = unvisited[-1]
+        unvisited = unvisited[:-1]
 
-def tour_length(tour: Tour, cities: List[City]) -> float:
-    return sum(
-        haversine(cities[tour[i]], cities[tour[(i + 1) % len(tour)]])
-        for i in range(len(tour))
-    )
+    return tour
 
-def nearest_neighbor_random(cities: List[City], k: int = 3) -> Tour:
-    unvisited = set(range(len(cities)))
+def _nearest_neighbor_on_graph(d: Matrix, tour: Tour, unvisited, k: int, neighbors) -> Tour:
+    # الـ candidates مترتبة بالمسافة، فأول k مش متزارين فيهم هما نفسهم أقرب k مش متزارين في الـ tour كله
+    nbr = neighbors.tolist()
+    visited = bytearray(len(d))
+    visited[tour[0]] = 1
+    position = np.empty(len(d), dtype=np.intp)
+    position[unvisited] = np.arange(len(unvisited))
+    left = len(unvisited)
+    while left:
+        kk = min(k, left)
+        options = []
+        for c in nbr[tour[-1]]:
+            if not visited[c]:
+                options.append(c)
+                if len(options) == kk:
+                    break
+        if len(options) < kk:
+            row = d[tour[-1], unvisited[:left]]
+            picks = np.argpartition(row, kk - 1)[:kk] if kk < left else np.arange(left)
+            options = unvisited[picks].tolist()
+        city = int(random.choice(options))
+        tour.append(city)
+        visited[city] = 1
+        # swap-remove من unvisited في O(1)
+        i, last = position[city], unvisited[left - 1]
+        unvisited[i], position[last] = last, i
+        left -= 1
+    return tour
 
-    start = random.choice(list(unvisited))
-    tour = [start]
-    unvisited.remove(start)
+def two_opt(tour: Tour, dist: Matrix, neighbors=None, k: int = 8) -> Tour:
+    # 2-opt بـ delta O(1): بنقارن الوصلتين اللي هيتشالوا بالوصلتين الجداد بدل ما نحسب الـ tour كله
+    # j محصور في أقرب k مدينة، و don't-look bits (queue) عشان منرجعش لمدن ملهاش تحسين
+    d = as_distance(dist)
+    n = len(tour)
+    if n < 4:
+        return list(tour)
+    if neighbors is None:
+        neighbors = nearest_neighbors(d, k)
+    nbr = neighbors.tolist()
+
+    tour = list(tour)
+    pos = positions(tour)
+    queue = deque(tour)
+    queued = [True] * n
+
+    while queue:
+        a = queue.popleft()
+        queued[a] = False
+        improved = False
+        for forward in (True, False):
+            i = pos[a]
+            b = tour[(i + 1) % n] if forward else tour[i - 1]
+            d_ab = d[a, b]
+            for c in nbr[a]:
+                d_ac = d[a, c]
+                if d_ac >= d_ab:
+                    break  # القائمة مترتبة، فمفيش مكسب بعد كده
+                j = pos[c]
+                e = tour[(j + 1) % n] if forward else tour[j - 1]
+                if c == b or e == a:
+                    continue
+                delta = d_ac + d[b, e] - d_ab - d[c, e]
+                if delta < -1e-9:
+                    if forward:
+                        reverse_segment(tour, pos, pos[b], pos[c])  # a b..c e -> a c..b e
+                    else:
+                        reverse_segment(tour, pos, pos[a], pos[e])  # b a..e c -> b e..a c
+                    for city in (a, b, c, e):
+                        if not queued[city]:
+                            queued[city] = True
+                            queue.append(city)
+                    improved = True
+                    break
+            if improved:
+                break
 
-    while unvisited:
-        last = tour[-1]
+    return tour
 
-        distances = sorted(
-            [(i, haversine(cities[last], cities[i])) for i in unvisited],
-            key=lambda x: x[1]
-        )
+def or_opt(tour: Tour, dist: Matrix, neighbors=None, k: int = 8, max_segment: int = 3) -> Tour:
+    # Or-opt: ننقل segment من 1 لـ 3 مدن لمكان تاني جنب واحد من أقرب جيرانها (بالاتجاهين)
+    d = as_distance(dist)
+    n = len(tour)
+    if n < 5:
+        return list(tour)
+    if neighbors is None:
+        neighbors = nearest_neighbors(d, k)
+    nbr = neighbors.tolist()
+
+    tour = list(tour)
+    pos = positions(tour)
+    queue = deque(tour)
+    queued = [True] * n
+
+    while queue:
+        s1 = queue.popleft()
+        queued[s1] = False
+        move = None
+        for length in range(1, min(max_segment, n - 3) + 1):
+            i = pos[s1]
+            segment = [tour[(i + t) % n] for t in range(length)]
+            s_last = segment[-1]
+            p, nx = tour[i - 1], tour[(i + length) % n]
+            remove_gain = d[p, s1] + d[s_last, nx] - d[p, nx]
+            if remove_gain <= 1e-9:
+                continue
+            for end, other in ((s1, s_last), (s_last, s1)):
+                for c in nbr[end]:
+                    d_c_end = d[c, end]
+                    if d_c_end >= remove_gain:
+                        break
+                    if c in segment:
+                        continue
+                    j = pos[c]
+                    for x, y in ((c, tour[(j + 1) % n]), (tour[j - 1], c)):
+                        if x in segment or y in segment:
+                            continue
+                        if x == c:  # c -> end ... other -> y
+                            delta = d_c_end + d[other, y] - d[c, y] - remove_gain
+                        else:       # x -> other ... end -> c
+                            delta = d[x, other] + d_c_end - d[x, c] - remove_gain
+                        if delta < -1e-9:
+                            first = end if x == c else other
+                            move = (length, x, first != s1, (p, nx, s1, s_last, x, y))
+                            break
+                    if move:
+                        break
+                if move:
+                    break
+            if move:
+                break
+
+        if move:
+            length, after, reverse, touched = move
+            move_segment(tour, pos, pos[s1], length, after, reverse)
+            for city in touched:
+                if not queued[city]:
+                    queued[city] = True
+                    queue.append(city)
 
-        candidates = distances[:min(k, len(distances))]
-        next_city = random.choice(candidates)[0]
+    return tour
 
-        tour.append(next_city)
-        unvisited.remove(next_city)
+def or3opt(tour: Tour, dist: Matrix, neighbors=None, k: int = 8) -> Tour:
+    # 3-opt من غير قلب أي segment (segment exchange):
+    # a t2..b g..c e  ->  a g..c t2..b e
+    d = as_distance(dist)
+    n = len(tour)
+    if n < 6:
+        return list(tour)
+    if neighbors is None:
+        neighbors = nearest_neighbors(d, k)
+    nbr = neighbors.tolist()
+
+    tour = list(tour)
+    pos = positions(tour)
+    queue = deque(tour)
+    queued = [True] * n
+
+    while queue:
+        a = queue.popleft()
+        queued[a] = False
+        pa = pos[a]
+        t2 = tour[(pa + 1) % n]
+        d1 = d[a, t2]
+        move = None
+        for g in nbr[a]:
+            g1 = d1 - d[a, g]
+            if g1 <= 0:
+                break
+            rg = (pos[g] - pa) % n
+            if rg < 2:
+                continue
+            b = tour[pos[g] - 1]
+            for c in nbr[t2]:
+                g2 = g1 + d[b, g] - d[c, t2]
+                if g2 <= 0:
+                    break
+                rc = (pos[c] - pa) % n
+                if rc < rg:
+                    continue
+                e = tour[(pos[c] + 1) % n]
+                if g2 + d[c, e] - d[b, e] > 1e-9:
+                    move = (rg, rc, b, c, e, g)
+                    break
+            if move:
+                break
+
+        if move:
+            rg, rc, b, c, e, g = move
+            # ننقل الـ segment الأقصر من الاتنين
+            if rc - rg + 1 <= rg - 1:
+                move_segment(tour, pos, pos[g], rc - rg + 1, a)
+            else:
+                move_segment(tour, pos, pos[t2], rg - 1, c)
+            for city in (a, t2, b, g, c, e):
+                if not queued[city]:
+                    queued[city] = True
+                    queue.append(city)
 
     return tour
 
-def two_opt(tour: Tour, cities: List[City]) -> Tour:
-    best = tour
-    best_dist = tour_length(best, cities)
-
+LOCAL_SEARCH_MOVES = {"2opt": two_opt, "oropt": or_opt, "or3opt": or3opt, "lk": lin_kernighan}
+
+def local_search(tour: Tour, dist: Matrix, moves=("2opt", "oropt", "or3opt"), k: int = 8, stats=NO_STATS,
+                 neighbors=None, lk_time_limit: Optional[float] = None) -> Tour:
+    # بنلف على الـ moves بالترتيب اللي اتطلب لحد ما ولا واحدة تحسن
+    # lk_time_limit ميزانية واحدة لكل مرات الـ lk مع بعض، مش لكل مرة
+    d = as_distance(dist)
+    lk_left = lk_time_limit
+    if neighbors is None:
+        with stats.phase("candidates"):
+            neighbors = nearest_neighbors(d, k)
+    best = list(tour)
+    best_len = tour_length(best, d)
     improved = True
     while improved:
         improved = False
-        for i in range(1, len(tour) - 2):
-            for j in range(i + 1, len(tour)):
-                if j - i == 1:
+        stats.add("iterations")
+        for name in moves:
+            options = {}
+            if name == "lk" and lk_left is not None:
+                if lk_left <= 0:
                     continue
-
-                new_tour = best[:]
-                new_tour[i:j] = reversed(best[i:j])
-
-                new_dist = tour_length(new_tour, cities)
-                if new_dist < best_dist:
-                    best = new_tour
-                    best_dist = new_dist
-                    improved = True
-
+                options["time_limit"] = lk_left
+            started = time.perf_counter()
+            with stats.phase(name):
+                candidate = LOCAL_SEARCH_MOVES[name](best, d, neighbors=neighbors, **options)
+            if options:
+                lk_left -= time.perf_counter() - started
+            candidate_len = tour_length(candidate, d)
+            if candidate_len < best_len - 1e-9:
+                best, best_len = candidate, candidate_len
+                improved = True
+                stats.improved(best_len)
     return best
 
-def print_simple_output(tour: Tour, names: List[str], cities: List[City]):
+def print_simple_output(tour: Tour, names: List[str], dist: Matrix):
     path = " -> ".join(names[i] for i in tour)
     path += f" -> {names[tour[0]]}"
 
     print("\nBest Tour:")
     print(path)
-    print("Total Distance:", round(tour_length(tour, cities), 2), "km")
+    print("Total Distance:", round(tour_length(tour, dist), 2), "km")
 
 
 def plot_map(cities: List[City], names: List[str], tour: Tour, filename: str):
+    if headless():
+        return
+    if len(tour) > LARGE_TOUR:
+        # marker و polyline لكل وصلة بيبقى HTML ضخم؛ هنا layer واحدة للخط وواحدة للمدن
+        tour_map(cities, tour, title=f"Nearest Neighbor + 2-opt - {len(tour)} Cities",
+                 start_name=names[tour[0]]).save(filename)
+        print("Map saved:", filename)
+        return
+
+    import folium
+    from folium.plugins import PolyLineTextPath
+
     m = folium.Map(location=cities[tour[0]], zoom_start=6)
 
     for order, city_index in enumerate(tour):
@@ -119,37 +344,43 @@ def plot_map(cities: List[City], names: List[str], tour: Tour, filename: str):
     m.save(filename)
     print("Map with clear arrows saved:", filename)
 
-print("Select number of cities:")
-print("1 - 5 Cities")
-print("2 - 15 Cities")
-print("3 - 20 Cities")
+def main():
+    print("Select number of cities:")
+    print("1 - 5 Cities")
+    print("2 - 15 Cities")
+    print("3 - 20 Cities")
+
+    choice = input("Your choice: ")
+
+    if choice == "1":
+        from cities_5 import get_cities, get_city_names
+        label = 5
+    elif choice == "2":
+        from cities_15 import get_cities, get_city_names
+        label = 15
+    elif choice == "3":
+        from cities_20 import get_cities, get_city_names
+        label = 20
+    else:
+        raise ValueError("Invalid choice!")
 
-choice = input("Your choice: ")
+    cities = get_cities()
+    names = get_city_names()
+    dist = distance_matrix(cities)
 
-if choice == "1":
-    from cities_5 import get_cities, get_city_names
-    label = 5
-elif choice == "2":
-    from cities_15 import get_cities, get_city_names
-    label = 15
-elif choice == "3":
-    from cities_20 import get_cities, get_city_names
-    label = 20
-else:
-    raise ValueError("Invalid choice!")
+    start_time = time.perf_counter()
 
-cities = get_cities()
-names = get_city_names()
+    tour = nearest_neighbor_random(dist, k=3, coords=cities)
+    tour = local_search(tour, dist, moves=("2opt", "oropt", "or3opt", "lk"))
 
-start_time = time.perf_counter()
+    end_time = time.perf_counter()
+    execution_time = end_time - start_time
 
-tour = nearest_neighbor_random(cities, k=3)
-tour = two_opt(tour, cities)
+    print_simple_output(tour, names, dist)
+    print("Execution Time:", round(execution_time, 4), "seconds")
 
-end_time = time.perf_counter()
-execution_time = end_time - start_time
+    plot_map(cities, names, tour, f"tsp_random_{label}.html")
 
-print_simple_output(tour, names, cities)
-print("Execution Time:", round(execution_time, 4), "seconds")
 
-plot_map(cities, names, tour, f"tsp_random_{label}.html")
+if __name__ == "__main__":
+    main()
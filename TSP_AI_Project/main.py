@@ -0,0 +1,128 @@
+"""Batch runner: any solver over any set of instances, no prompts, JSONL out.
+
+    python main.py --solver nn_2opt --solver ga egypt20 random:500:1 instances/ \
+        --param generations=200 --jobs 4 --output results.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+import traceback
+from multiprocessing import Pool
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from utils.cache import DEFAULT_PATH, SolutionCache
+from utils.instances import instance_specs, load_instance
+from utils.solvers import SOLVERS, solve, solver_params
+from utils.stats import SolverStats
+
+
+def parse_params(pairs):
+    params = {}
+    for pair in pairs:
+        key, _, value = pair.partition("=")
+        try:
+            params[key] = json.loads(value)
+        except ValueError:
+            params[key] = value  # string زي moves=2opt,lk
+    return params
+
+
+def params_for(solver, params):
+    # "ga.generations=50" لـ solver واحد؛ من غير prefix بيروح لكل solver بيقبله
+    chosen = {k: v for k, v in params.items() if "." not in k and k in solver_params(solver)}
+    for key, value in params.items():
+        scope, _, name = key.partition(".")
+        if name and scope == solver:
+            chosen[name] = value
+    return chosen
+
+
+def _print_event(instance, solver):
+    # event لكل سطر JSON على stderr عشان stdout يفضل للنتايج
+    def callback(event, data):
+        print(json.dumps({"instance": instance, "solver": solver, "event": event, **data}),
+              file=sys.stderr, flush=True)
+    return callback
+
+
+def run_task(task):
+    spec, solver, params, keep_tour, profile, trace, cache_path = task
+    record = {"instance": spec, "solver": solver, "params": params}
+    cache = None
+    try:
+        instance = load_instance(spec)
+        stats = SolverStats(timers=profile, memory=profile,
+                            callback=_print_event(instance["name"], solver) if trace else None)
+        # كل task بتفتح connection بتاعتها؛ الـ connections مبتتنقلش بين الـ processes
+        cache = SolutionCache(cache_path) if cache_path else None
+        result = solve(solver, coords=instance["coords"], dist=instance["dist"],
+                       metric=instance["metric"], stats=stats, cache=cache, **params)
+        record.update(result)
+        record["instance"] = instance["name"]
+        if not keep_tour:
+            del record["tour"]
+    except Exception as exc:
+        # instance واحدة بايظة متوقفش الـ batch كله
+        record["error"] = f"{type(exc).__name__}: {exc}"
+        record["traceback"] = traceback.format_exc()
+    finally:
+        if cache is not None:
+            cache.close()
+    return record
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run TSP solvers over instances and write JSONL results.")
+    parser.add_argument("instances", nargs="+",
+                        help="egypt5/15/20, random:<n>[:<seed>], .json/.tsp/.csv files, directories or .txt manifests")
+    parser.add_argument("--solver", action="append", choices=sorted(SOLVERS), required=True,
+                        help="solver to run (repeat for several)")
+    parser.add_argument("--param", action="append", default=[], metavar="KEY=VALUE",
+                        help="solver parameter, value parsed as JSON when possible; prefix with "
+                             "'<solver>.' to target one solver (repeatable)")
+    parser.add_argument("--jobs", type=int, default=1, help="instances solved concurrently")
+    parser.add_argument("--output", help="JSONL file (default: stdout)")
+    parser.add_argument("--no-tour", action="store_true", help="leave tours out of the output")
+    parser.add_argument("--profile", action="store_true",
+                        help="add phase timings and the tracemalloc peak to each record's stats (slower)")
+    parser.add_argument("--trace", action="store_true",
+                        help="stream solver events (improvements, phases, generations) to stderr as JSONL")
+    parser.add_argument("--cache", nargs="?", const=DEFAULT_PATH, metavar="PATH",
+                        help=f"reuse results stored in a SQLite solution cache (default {DEFAULT_PATH})")
+    args = parser.parse_args(argv)
+
+    params = parse_params(args.param)
+    for key in params:
+        scope, _, name = key.partition(".")
+        if name:
+            known = scope in SOLVERS and name in solver_params(scope)
+        else:
+            known = any(key in solver_params(s) for s in args.solver)
+        if not known:
+            parser.error(f"parameter {key!r} is not accepted by any selected solver")
+    tasks = [(spec, solver, params_for(solver, params), not args.no_tour, args.profile, args.trace, args.cache)
+             for spec in instance_specs(args.instances) for solver in args.solver]
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    failed = 0
+    try:
+        pool = Pool(args.jobs) if args.jobs > 1 else None
+        try:
+            results = pool.imap_unordered(run_task, tasks) if pool else map(run_task, tasks)
+            for record in results:
+                failed += "error" in record
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+import itertools
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import utils.cache
+from utils.cache import SCHEMA_VERSION, SolutionCache, cache_key, fingerprint
+
+RESULT = {"tour": [0, 1, 2], "cost": 1.0}
+SIZE = len(json.dumps(RESULT))
+
+
+def _clock(monkeypatch):
+    # ساعة بتزيد بثانية كل نداء عشان ترتيب الـ LRU ميعتمدش على دقة time.time
+    ticks = itertools.count(1000)
+    monkeypatch.setattr(utils.cache.time, "time", lambda: float(next(ticks)))
+
+
+def test_lru_eviction_by_size(monkeypatch):
+    _clock(monkeypatch)
+    cache = SolutionCache(":memory:", max_bytes=2 * SIZE)
+    cache.put("a", "ga", 1, RESULT)
+    cache.put("b", "ga", 1, RESULT)
+    assert cache.get("a") == RESULT          # a بقت أحدث من b
+    cache.put("c", "ga", 1, RESULT)
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == RESULT and cache.get("c") == RESULT
+
+
+def test_entry_larger_than_the_cache_is_not_kept(monkeypatch):
+    _clock(monkeypatch)
+    cache = SolutionCache(":memory:", max_bytes=SIZE - 1)
+    cache.put("a", "ga", 1, RESULT)
+    assert len(cache) == 0
+
+
+def test_new_solver_version_drops_older_entries():
+    cache = SolutionCache(":memory:")
+    cache.put("a", "ga", 1, RESULT)
+    cache.put("b", "ga", 1, RESULT)
+    cache.put("x", "tabu", 1, RESULT)
+    cache.put("c", "ga", 2, RESULT)
+    assert cache.get("a") is None and cache.get("b") is None
+    assert cache.get("c") == RESULT and cache.get("x") == RESULT
+
+
+def test_other_schema_is_dropped_on_open(tmp_path):
+    path = str(tmp_path / "solutions.sqlite")
+    cache = SolutionCache(path)
+    cache.put("a", "ga", 1, RESULT)
+    cache.db.execute("UPDATE solutions SET schema = ?", (SCHEMA_VERSION - 1,))
+    cache.db.commit()
+    cache.close()
+    assert len(SolutionCache(path)) == 0
+
+
+def test_key_depends_on_every_part():
+    inst = fingerprint([[0.0, 1.0], [1.0, 0.0]])
+    base = cache_key(inst, "ga", 1, {"seed": 1})
+    assert base == cache_key(inst, "ga", 1, {"seed": 1})
+    assert base != cache_key(inst, "ga", 2, {"seed": 1})
+    assert base != cache_key(inst, "ga", 1, {"seed": 2})
+    assert base != cache_key(fingerprint([[0.0, 2.0], [2.0, 0.0]]), "ga", 1, {"seed": 1})
@@ -0,0 +1,63 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.candidates import knn_graph, quadrant_neighbors
+from utils.geodesic import distance_matrix
+
+
+def _coords(n, seed, clustered=False):
+    rng = np.random.default_rng(seed)
+    if clustered:
+        # كام cluster صغير عشان الـ grid cells تبقى مش متساوية
+        centers = np.column_stack((rng.uniform(22, 31, 5), rng.uniform(25, 35, 5)))
+        return centers[rng.integers(0, 5, n)] + rng.normal(0, 0.05, (n, 2))
+    return np.column_stack((rng.uniform(22, 31, n), rng.uniform(25, 35, n)))
+
+
+def _brute_knn(dist, k):
+    d = dist.copy()
+    np.fill_diagonal(d, np.inf)
+    return np.argsort(d, axis=1, kind="stable")[:, :k]
+
+
+@pytest.mark.parametrize("n, k, per_cell, clustered", [(300, 8, None, False), (300, 10, 2, False),
+                                                       (400, 8, 4, True), (9, 12, None, False)])
+def test_knn_graph_matches_brute_force(n, k, per_cell, clustered):
+    coords = _coords(n, n + k, clustered)
+    dist = distance_matrix(coords)
+    got = knn_graph(coords, k, per_cell=per_cell)
+    expected = _brute_knn(dist, min(k, n - 1))
+    assert got.shape == expected.shape and got.dtype == np.int32
+    rows = np.arange(n)[:, None]
+    # بنقارن المسافات مش الـ indices عشان لو فيه تعادل
+    np.testing.assert_allclose(dist[rows, got], dist[rows, expected])
+
+
+def _brute_quadrant(coords, dist, k):
+    pool = _brute_knn(dist, 3 * k)
+    out = []
+    for i, row in enumerate(pool):
+        delta = coords[row] - coords[i]
+        quadrant = (delta[:, 0] < 0) * 2 + (delta[:, 1] < 0)
+        picked = []
+        for q in range(4):
+            picked += [j for j, qj in zip(row, quadrant) if qj == q][:k // 4]
+        picked += [j for j in row if j not in picked][:k - len(picked)]
+        out.append(sorted(picked, key=lambda j: dist[i, j]))
+    return np.array(out)
+
+
+@pytest.mark.parametrize("n, k, clustered", [(300, 8, False), (300, 12, True), (60, 5, False)])
+def test_quadrant_neighbors_matches_brute_force(n, k, clustered):
+    coords = _coords(n, n * k, clustered)
+    dist = distance_matrix(coords)
+    got = quadrant_neighbors(coords, k)
+    expected = _brute_quadrant(coords, dist, k)
+    assert got.shape == expected.shape
+    assert [sorted(r) for r in got.tolist()] == [sorted(r) for r in expected.tolist()]
+    rows = np.arange(n)[:, None]
+    assert (np.diff(dist[rows, got], axis=1) >= 0).all()
@@ -0,0 +1,28 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.comparison import _run_one, compare
+
+
+def test_failures_are_recorded_with_traceback():
+    # TypeError مكانش بيتمسك قبل كده وكان بيوقع الـ suite كله
+    record = _run_one(("egypt5", "nn_2opt", {"bogus": 1}))
+    assert record["error"].startswith("TypeError")
+    assert "Traceback" in record["traceback"]
+
+
+def test_run_records_memory_growth():
+    record = _run_one(("egypt5", "nn_2opt", {"seed": 1}))
+    assert "error" not in record and record["n"] == 5
+    assert record["peak_memory_mb"] is None or record["peak_memory_mb"] >= 0
+
+
+def test_compare_flags_failures_and_slowdowns():
+    old = {"instance": "egypt5", "solver": "ga", "cost": 100.0, "time": 1.0, "peak_memory_mb": 1.0}
+    new = dict(old, time=2.0, peak_memory_mb=2.0)
+    problems = compare({"records": [old]}, {"records": [new]})
+    # الـ memory زادت ضعف بس بأقل من MEMORY_SLACK فمش regression
+    assert len(problems) == 1 and "time" in problems[0]
+    failed = {"instance": "egypt5", "solver": "ga", "error": "MemoryError: "}
+    assert "now fails" in compare({"records": [old]}, {"records": [failed]})[0]
@@ -0,0 +1,88 @@
+import itertools
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "AlgoUCS"))
+sys.path.insert(0, os.path.join(ROOT, "Branch_and_Bound"))
+from utils.geodesic import distance_matrix, tour_length
+from utils.stats import SolverStats
+from branch_and_bound import branch_and_bound_tsp
+from held_karp import held_karp
+from UCS_Algorithm import ucs_tsp
+
+
+def _instance(n, seed):
+    rng = np.random.default_rng(seed)
+    return distance_matrix(np.column_stack((rng.uniform(22, 31, n), rng.uniform(25, 35, n))))
+
+
+def brute_force(dist):
+    # كل الـ tours اللي بتبدأ من 0 مرة واحدة (10 مدن = 9! صف)
+    n = len(dist)
+    rest = np.array(list(itertools.permutations(range(1, n))), dtype=np.intp).reshape(-1, n - 1)
+    tours = np.hstack((np.zeros((len(rest), 1), dtype=np.intp), rest))
+    return float(dist[tours, np.roll(tours, -1, axis=1)].sum(axis=1).min())
+
+
+def _closed_tour(path, n):
+    assert path[0] == path[-1] and sorted(path[:-1]) == list(range(n))
+    return path[:-1]
+
+
+@pytest.mark.parametrize("n, seed, workers", [(6, 1, 1), (8, 2, 1), (9, 3, 1), (9, 4, 2)])
+def test_held_karp_matches_brute_force(n, seed, workers):
+    dist = _instance(n, seed)
+    path, cost = held_karp(dist, start_index=seed % n, workers=workers)
+    assert path[0] == seed % n
+    assert tour_length(_closed_tour(path, n), dist) == pytest.approx(cost)
+    assert cost == pytest.approx(brute_force(dist), rel=1e-5)
+
+
+def test_held_karp_refuses_by_memory_estimate():
+    with pytest.raises(MemoryError):
+        held_karp(_instance(12, 0), max_memory=1024)
+    # أكبر من حدود الـ int8 parent: الـ estimate لوحده بيرفضه
+    with pytest.raises(MemoryError):
+        held_karp(_instance(200, 0))
+
+
+@pytest.mark.parametrize("n, seed", [(8, 10), (9, 11), (10, 12), (10, 13)])
+def test_branch_and_bound_matches_brute_force(n, seed):
+    dist = _instance(n, seed)
+    path, cost, counters = branch_and_bound_tsp(dist, start_index=seed % n)
+    assert path[0] == seed % n and counters["optimal"]
+    assert tour_length(_closed_tour(path, n), dist) == pytest.approx(cost)
+    assert cost == pytest.approx(brute_force(dist))
+
+
+@pytest.mark.parametrize("n", [1, 2, 3])
+def test_branch_and_bound_tiny_publishes_counters(n):
+    stats = SolverStats()
+    path, _, counters = branch_and_bound_tsp(_instance(n, 0), stats=stats)
+    assert sorted(path[:-1]) == list(range(n))
+    assert stats.counters == counters
+
+
+@pytest.mark.parametrize("n", [1, 2, 3])
+def test_ucs_tiny_instances(n):
+    dist = _instance(n, n)
+    for start in range(n):
+        stats = SolverStats()
+        path, cost = ucs_tsp(dist.tolist(), start, stats=stats)
+        assert path[0] == start
+        assert tour_length(_closed_tour(path, n), dist) == pytest.approx(cost)
+        # 3 مدن أو أقل: أي tour هو الأحسن
+        assert cost == pytest.approx(tour_length(list(range(n)), dist))
+        assert "nodes_expanded" in stats.counters
+
+
+def test_ucs_matches_brute_force():
+    dist = _instance(7, 20)
+    path, cost = ucs_tsp(dist.tolist(), 3)
+    assert tour_length(_closed_tour(path, 7), dist) == pytest.approx(cost)
+    assert cost == pytest.approx(brute_force(dist))
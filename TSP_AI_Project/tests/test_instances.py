@@ -0,0 +1,68 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.instances import euc_2d_matrix, load_instance
+from utils.solvers import solve
+
+# matrix متماثلة 5x5 بأرقام مختلفة عشان أي غلطة في الترتيب تبان
+MATRIX = np.array([[0, 3, 4, 2, 7],
+                   [3, 0, 4, 6, 3],
+                   [4, 4, 0, 5, 8],
+                   [2, 6, 5, 0, 6],
+                   [7, 3, 8, 6, 0]], dtype=np.float64)
+
+
+def _weights(fmt):
+    n = len(MATRIX)
+    if fmt == "FULL_MATRIX":
+        return MATRIX.ravel()
+    if fmt == "UPPER_ROW":
+        return np.concatenate([MATRIX[i, i + 1:] for i in range(n)])
+    if fmt == "LOWER_DIAG_ROW":
+        return np.concatenate([MATRIX[i, :i + 1] for i in range(n)])
+    # UPPER_COL: عمود عمود فوق الـ diagonal
+    return np.concatenate([MATRIX[:j, j] for j in range(n)])
+
+
+def _write(tmp_path, name, lines):
+    path = tmp_path / name
+    path.write_text("\n".join(lines) + "\nEOF\n")
+    return str(path)
+
+
+@pytest.mark.parametrize("fmt", ["FULL_MATRIX", "UPPER_ROW", "LOWER_DIAG_ROW", "UPPER_COL"])
+def test_explicit_formats(tmp_path, fmt):
+    numbers = [str(int(w)) for w in _weights(fmt)]
+    # الأرقام متقسمة على سطور بأطوال مختلفة زي ملفات TSPLIB الحقيقية
+    rows = [" ".join(numbers[i:i + 3]) for i in range(0, len(numbers), 3)]
+    path = _write(tmp_path, "m5.tsp", ["NAME: m5", "TYPE: TSP", "DIMENSION: 5", "EDGE_WEIGHT_TYPE: EXPLICIT",
+                                       f"EDGE_WEIGHT_FORMAT: {fmt}", "EDGE_WEIGHT_SECTION"] + rows)
+    instance = load_instance(path)
+    assert instance["name"] == "m5" and instance["coords"] is None
+    np.testing.assert_array_equal(instance["dist"], MATRIX)
+
+
+def test_geo_coordinates_are_degrees_and_minutes(tmp_path):
+    path = _write(tmp_path, "g3.tsp", ["NAME: g3", "DIMENSION: 3", "EDGE_WEIGHT_TYPE: GEO", "NODE_COORD_SECTION",
+                                       "1 30.30 31.15", "2 -29.45 25.00", "3 31.12 -29.54"])
+    instance = load_instance(path)
+    assert instance["metric"] == "geo" and instance["dist"] is None
+    np.testing.assert_allclose(instance["coords"], [[30.5, 31.25], [-29.75, 25.0], [31.2, -29.9]])
+
+
+def test_euc_2d(tmp_path):
+    path = _write(tmp_path, "e4.tsp", ["NAME: e4", "DIMENSION: 4", "EDGE_WEIGHT_TYPE: EUC_2D", "NODE_COORD_SECTION",
+                                       "1 0 0", "2 3 4", "3 1 1", "4 0.5 -0.4"])
+    instance = load_instance(path)
+    assert instance["metric"] == "euc_2d"
+    np.testing.assert_array_equal(instance["coords"], [[0, 0], [3, 4], [1, 1], [0.5, -0.4]])
+    dist = euc_2d_matrix(instance["coords"])
+    # TSPLIB nint: sqrt(2) -> 1، sqrt(0.41) -> 1
+    assert dist[0, 1] == 5 and dist[0, 2] == 1 and dist[0, 3] == 1 and dist[1, 2] == 4
+    # 4 مدن: 3 tours بس
+    best = min(sum(dist[t[i], t[(i + 1) % 4]] for i in range(4)) for t in ([0, 1, 2, 3], [0, 1, 3, 2], [0, 2, 1, 3]))
+    assert solve("held_karp", coords=instance["coords"], metric="euc_2d")["cost"] == best
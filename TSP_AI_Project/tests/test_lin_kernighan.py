@@ -0,0 +1,50 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.geodesic import distance_matrix, tour_length
+from utils.lin_kernighan import lin_kernighan, lk_requested
+
+
+def _instance(n, seed):
+    rng = np.random.default_rng(seed)
+    return distance_matrix(np.column_stack((rng.uniform(22, 31, n), rng.uniform(25, 35, n))))
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_lk_returns_permutation_and_never_worse(seed):
+    dist = _instance(200, seed)
+    start = np.random.default_rng(seed).permutation(200).tolist()
+    tour = lin_kernighan(start, dist)
+    assert sorted(tour) == list(range(200))
+    assert tour_length(tour, dist) <= tour_length(start, dist) + 1e-9
+
+
+def test_lk_small_tours_unchanged():
+    dist = _instance(4, 0)
+    assert lin_kernighan([2, 0, 3, 1], dist) == [2, 0, 3, 1]
+
+
+def test_lk_respects_time_limit():
+    dist = _instance(2000, 5)
+    start = np.random.default_rng(5).permutation(2000).tolist()
+    t0 = time.time()
+    tour = lin_kernighan(start, dist, time_limit=0.05)
+    # من غير الـ limit الـ run ده بياخد ~3 ثواني؛ المهلة واسعة عشان الـ machine بطيئة
+    assert time.time() - t0 < 1.0
+    assert sorted(tour) == list(range(2000))
+
+
+def test_lk_is_opt_in(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["script.py"])
+    monkeypatch.delenv("TSP_LK", raising=False)
+    assert not lk_requested()
+    monkeypatch.setenv("TSP_LK", "1")
+    assert lk_requested()
+    monkeypatch.setenv("TSP_LK", "0")
+    monkeypatch.setattr(sys, "argv", ["script.py", "--lk"])
+    assert lk_requested()
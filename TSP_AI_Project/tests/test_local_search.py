@@ -0,0 +1,49 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "TSP_Nearest_Neighbor_2_opt"))
+from utils.candidates import knn_graph
+from utils.geodesic import GeoDistance, distance_matrix, tour_length
+from Map import or3opt, or_opt, two_opt
+
+
+def _coords(n, seed):
+    rng = np.random.default_rng(seed)
+    return np.column_stack((rng.uniform(22, 31, n), rng.uniform(25, 35, n)))
+
+
+@pytest.mark.parametrize("move", [or_opt, or3opt])
+@pytest.mark.parametrize("n, seed", [(6, 0), (7, 1), (50, 2), (300, 3)])
+def test_move_keeps_permutation_and_never_worsens(move, n, seed):
+    dist = distance_matrix(_coords(n, seed))
+    start = np.random.default_rng(seed).permutation(n).tolist()
+    tour = move(start, dist)
+    assert sorted(tour) == list(range(n))
+    assert tour_length(tour, dist) <= tour_length(start, dist) + 1e-9
+    if n >= 50:
+        # من random start لازم يلاقي تحسين فعلاً
+        assert tour_length(tour, dist) < tour_length(start, dist)
+
+
+@pytest.mark.parametrize("move", [or_opt, or3opt])
+def test_move_after_two_opt(move):
+    coords = _coords(400, 4)
+    dist = distance_matrix(coords)
+    start = two_opt(np.random.default_rng(4).permutation(400).tolist(), dist)
+    neighbors = knn_graph(coords, 8)
+    tour = move(start, dist, neighbors)
+    assert sorted(tour) == list(range(400))
+    assert tour_length(tour, dist) <= tour_length(start, dist) + 1e-9
+    # نفس النتيجة من الـ coords on demand (GeoDistance)
+    assert move(start, GeoDistance(coords), neighbors) == tour
+
+
+@pytest.mark.parametrize("move", [or_opt, or3opt])
+def test_move_small_tours_unchanged(move):
+    dist = distance_matrix(_coords(4, 5))
+    assert move([3, 1, 0, 2], dist) == [3, 1, 0, 2]
@@ -0,0 +1,30 @@
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "Hill_Climbing Algorithm"))
+from metaheuristics import simulated_annealing, tabu_search
+from utils.geodesic import distance_matrix, tour_length
+
+
+def _instance(n, seed):
+    rng = np.random.default_rng(seed)
+    return distance_matrix(np.column_stack((rng.uniform(22, 31, n), rng.uniform(25, 35, n))))
+
+
+@pytest.mark.parametrize("search", [simulated_annealing, tabu_search])
+def test_needs_a_budget(search):
+    with pytest.raises(ValueError):
+        search(_instance(10, 0), time_limit=None, max_iterations=None)
+
+
+@pytest.mark.parametrize("search", [simulated_annealing, tabu_search])
+def test_iteration_budget_returns_a_tour(search):
+    dist = _instance(30, 1)
+    route, cost = search(dist, random.Random(1), time_limit=None, max_iterations=500)
+    assert sorted(route) == list(range(30))
+    assert cost == pytest.approx(tour_length(route, dist))
@@ -0,0 +1,43 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "Genetic_Algorithm"))
+from operators import CROSSOVERS, MUTATIONS
+
+
+def _parents(count, N, seed):
+    rng = np.random.default_rng(seed)
+    return (np.array([rng.permutation(N) for _ in range(count)]),
+            np.array([rng.permutation(N) for _ in range(count)]), rng)
+
+
+@pytest.mark.parametrize("name", sorted(CROSSOVERS))
+@pytest.mark.parametrize("N", [3, 4, 9, 50, 200])
+def test_crossover_children_are_permutations(name, N):
+    P1, P2, rng = _parents(64, N, N)
+    children = CROSSOVERS[name](P1, P2, rng)
+    assert children.shape == P1.shape
+    assert (np.sort(children, axis=1) == np.arange(N)).all()
+
+
+@pytest.mark.parametrize("name", sorted(CROSSOVERS))
+def test_crossover_of_identical_parents(name):
+    P1, _, rng = _parents(16, 30, 1)
+    # الأب والأم نفس الـ tour: الابن لازم يطلع نفس الـ tour (بالترتيب الدائري على الأقل)
+    children = CROSSOVERS[name](P1, P1.copy(), rng)
+    for parent, child in zip(P1.tolist(), children.tolist()):
+        shift = child.index(parent[0])
+        rotated = child[shift:] + child[:shift]
+        assert rotated == parent or rotated == [parent[0]] + parent[1:][::-1]
+
+
+@pytest.mark.parametrize("name", sorted(MUTATIONS))
+def test_mutation_keeps_permutations(name):
+    P1, _, rng = _parents(64, 40, 2)
+    mutated = MUTATIONS[name](P1.copy(), rng, 0.5)
+    assert (np.sort(mutated, axis=1) == np.arange(40)).all()
@@ -0,0 +1,75 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.solvers import SOLVERS, solve
+
+# instances صغيرة لدرجة إن الـ operators العادية مبتشتغلش عليها
+TINY = {n: [[30.0 + 0.3 * i, 31.0 + 0.7 * i] for i in range(n)] for n in (1, 2, 3)}
+
+
+@pytest.mark.parametrize("name, params", [("ga", {"seed": 1}), ("island_ga", {"seed": 1, "workers": 1})])
+@pytest.mark.parametrize("n", sorted(TINY))
+def test_ga_tiny_instances(name, params, n):
+    assert sorted(solve(name, TINY[n], **params)["tour"]) == list(range(n))
+
+
+@pytest.mark.parametrize("name", sorted(SOLVERS))
+@pytest.mark.parametrize("n", [1, 2])
+def test_every_solver_tiny_instances(name, n):
+    params = {"workers": 1} if name in ("island_ga", "hill_climbing", "held_karp") else {}
+    assert sorted(solve(name, TINY[n], **params)["tour"]) == list(range(n))
+
+
+def test_ucs_refuses_more_than_63_cities():
+    with pytest.raises(ValueError):
+        solve("ucs", [[30.0 + 0.01 * i, 31.0] for i in range(64)])
+
+
+def test_quadrant_candidates_need_coordinates():
+    from utils.geodesic import distance_matrix
+    coords = [[30.0 + 0.3 * i, 31.0 + 0.7 * (i % 3)] for i in range(12)]
+    assert sorted(solve("nn_2opt", coords, seed=1, quadrant=True)["tour"]) == list(range(12))
+    with pytest.raises(ValueError):
+        solve("nn_2opt", dist=distance_matrix(coords), seed=1, quadrant=True)
+    with pytest.raises(ValueError):
+        solve("nn_2opt", coords, metric="euc_2d", seed=1, quadrant=True)
+
+
+def test_cache_is_keyed_on_the_matrix():
+    from utils.cache import SolutionCache
+    from utils.geodesic import distance_matrix
+    coords = [[30.0 + 0.3 * i, 31.0 + 0.7 * (i % 3)] for i in range(8)]
+    cache = SolutionCache(":memory:")
+    first = solve("astar", coords, cache=cache)
+    again = solve("astar", dist=distance_matrix(coords), cache=cache)
+    assert again.get("cached") and again["tour"] == first["tour"]
+
+
+def test_time_limited_runs_are_not_cached():
+    from utils.cache import SolutionCache
+    coords = [[30.0 + 0.3 * i, 31.0 + 0.7 * (i % 3)] for i in range(8)]
+    cache = SolutionCache(":memory:")
+    solve("annealing", coords, cache=cache, time_limit=0.05)
+    solve("nn_2opt", coords, cache=cache, seed=1, lk_time_limit=0.05)
+    assert len(cache) == 0
+    solve("annealing", coords, cache=cache, time_limit=None, max_iterations=1000)
+    assert len(cache) == 1
+
+
+@pytest.mark.parametrize("name", ["ga", "island_ga"])
+def test_ga_zero_generations(name):
+    coords = [[30.0 + 0.3 * i, 31.0 + 0.7 * (i % 3)] for i in range(12)]
+    params = {"workers": 1} if name == "island_ga" else {}
+    assert sorted(solve(name, coords, seed=1, generations=0, **params)["tour"]) == list(range(12))
+
+
+def test_cache_ignores_workers():
+    from utils.cache import SolutionCache
+    coords = [[30.0 + 0.3 * i, 31.0 + 0.7 * (i % 3)] for i in range(8)]
+    cache = SolutionCache(":memory:")
+    first = solve("island_ga", coords, cache=cache, seed=1, generations=20, workers=1)
+    again = solve("island_ga", coords, cache=cache, seed=1, generations=20, workers=2)
+    assert again.get("cached") and again["tour"] == first["tour"]
@@ -0,0 +1,88 @@
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "TSP_Nearest_Neighbor_2_opt"))
+from utils.geodesic import unit_vectors
+from utils.solvers import solve
+from utils.spatial import SphereGrid
+from Map import nearest_neighbor_random
+
+# الحالات اللي كان nearest بيلف فيها للأبد: نقط أقل من k، أو كلها في نفس المكان
+
+
+def test_nn_2opt_two_cities():
+    assert sorted(solve("nn_2opt", coords=[[30.04, 31.23], [31.20, 29.91]])["tour"]) == [0, 1]
+
+
+def test_nearest_neighbor_three_cities():
+    random.seed(0)
+    coords = [[30.04, 31.23], [31.20, 29.91], [25.68, 32.64]]
+    assert sorted(nearest_neighbor_random(None, k=3, coords=coords)) == [0, 1, 2]
+
+
+@pytest.mark.parametrize("n", [2, 3, 10, 34, 100])
+def test_duplicate_points(n):
+    random.seed(0)
+    assert sorted(nearest_neighbor_random(None, k=3, coords=[[30.0, 31.0]] * n)) == list(range(n))
+
+
+def test_nearest_asks_for_more_than_alive():
+    grid = SphereGrid([[30.0, 31.0], [30.5, 31.5], [29.0, 32.0]])
+    grid.remove(0)
+    assert sorted(grid.nearest(0, 5)) == [1, 2]
+    grid.remove(1)
+    grid.remove(2)
+    assert grid.nearest(0, 3) == []
+
+
+def test_nearest_matches_brute_force_after_removals():
+    rng = np.random.default_rng(3)
+    coords = np.column_stack((rng.uniform(22, 31, 500), rng.uniform(25, 35, 500)))
+    xyz = unit_vectors(coords)
+    grid = SphereGrid(coords)
+    alive = set(range(500))
+    # كفاية removals عشان الـ grid يتبني من جديد أكتر من مرة
+    for i in rng.permutation(500)[:450].tolist():
+        grid.remove(i)
+        alive.discard(i)
+        others = sorted(alive)
+        d2 = ((xyz[others] - xyz[i]) ** 2).sum(axis=1)
+        expected = [others[j] for j in np.argsort(d2, kind="stable")[:4]]
+        assert sorted(grid.nearest(i, 4)) == sorted(expected)
+
+
+@pytest.mark.parametrize("n", [1, 7, 300])
+def test_remove_every_point_in_order(n):
+    rng = np.random.default_rng(n)
+    coords = np.column_stack((rng.uniform(22, 31, n), rng.uniform(25, 35, n)))
+    xyz = unit_vectors(coords)
+    grid = SphereGrid(coords)
+    for i in range(n):
+        grid.remove(i)
+        assert len(grid) == n - 1 - i
+        if i + 1 < n:
+            # الأقرب للنقطة اللي اتشالت لسه لازم يطابق الـ brute force لحد آخر نقطة
+            others = np.arange(i + 1, n)
+            expected = others[np.argmin(((xyz[others] - xyz[i]) ** 2).sum(axis=1))]
+            assert grid.nearest(i, 1) == [expected]
+    assert grid.nearest(0, 3) == []
+
+
+def test_nearest_neighbour_walk_visits_everything():
+    # نفس طريقة nearest_neighbor_random: شيل المدينة الحالية وروح لأقرب واحدة
+    rng = np.random.default_rng(8)
+    coords = np.column_stack((rng.uniform(22, 31, 400), rng.uniform(25, 35, 400)))
+    grid = SphereGrid(coords)
+    tour = [0]
+    grid.remove(0)
+    while len(grid):
+        (nxt,) = grid.nearest(tour[-1], 1)
+        grid.remove(nxt)
+        tour.append(nxt)
+    assert sorted(tour) == list(range(400))
@@ -0,0 +1,95 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+# الـ cache في ملف SQLite واحد؛ ممكن أكتر من process يستخدموه في نفس الوقت (WAL)
+DEFAULT_PATH = os.environ.get(
+    "TSP_CACHE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".cache", "solutions.sqlite"))
+DEFAULT_MAX_BYTES = 256 * 1024 ** 2
+# بيتزود لما شكل الـ key أو الـ payload يتغير، وبيمسح كل اللي قبله
+SCHEMA_VERSION = 2
+
+
+def fingerprint(dist, coords=None):
+    """Canonical hash of an instance: the float64 matrix, plus the coordinates if a solver gets them."""
+    h = hashlib.sha256()
+    for array in (dist, coords):
+        if array is None:
+            h.update(b"-")
+            continue
+        array = np.ascontiguousarray(array, dtype=np.float64)
+        h.update(repr(array.shape).encode())
+        h.update(array.tobytes())
+    return h.hexdigest()
+
+
+def cache_key(instance, solver, version, params):
+    # params لازم يكونوا كاملين (بالـ defaults) عشان نفس الـ run يدي نفس الـ key
+    text = json.dumps([SCHEMA_VERSION, instance, solver, version, params], sort_keys=True, default=str)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class SolutionCache:
+    """On-disk store of solve() results, evicting least recently used entries past max_bytes.
+
+    Entries remember the solver version they were made with; storing a result for a newer
+    version drops that solver's older entries.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("""CREATE TABLE IF NOT EXISTS solutions (
+            key TEXT PRIMARY KEY, solver TEXT, version INTEGER, schema INTEGER,
+            payload TEXT, size INTEGER, last_used REAL)""")
+        self.db.execute("CREATE INDEX IF NOT EXISTS solutions_lru ON solutions (last_used)")
+        self.db.execute("DELETE FROM solutions WHERE schema != ?", (SCHEMA_VERSION,))
+        self.db.commit()
+
+    def get(self, key):
+        row = self.db.execute("SELECT payload FROM solutions WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self.db.execute("UPDATE solutions SET last_used = ? WHERE key = ?", (time.time(), key))
+        self.db.commit()
+        return json.loads(row[0])
+
+    def put(self, key, solver, version, result):
+        payload = json.dumps(result)
+        with self.db:
+            self.db.execute("DELETE FROM solutions WHERE solver = ? AND version != ?", (solver, version))
+            self.db.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (key, solver, version, SCHEMA_VERSION, payload, len(payload), time.time()))
+            self._evict()
+
+    def _evict(self):
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM solutions").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # الأقدم استخدام الأول لحد ما نرجع تحت الحد
+        rows = self.db.execute("SELECT key, size FROM solutions ORDER BY last_used").fetchall()
+        doomed = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self.db.executemany("DELETE FROM solutions WHERE key = ?", doomed)
+
+    def clear(self):
+        with self.db:
+            self.db.execute("DELETE FROM solutions")
+
+    def __len__(self):
+        return self.db.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def close(self):
+        self.db.close()
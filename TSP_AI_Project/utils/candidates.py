@@ -0,0 +1,150 @@
+import math
+
+import numpy as np
+
+from utils.geodesic import unit_vectors
+
+BLOCK_ROWS = 1024
+# chunks لـ _top_k عشان خلية زحمة (مدن متكدسة في مكان واحد) متعملش matrix ضخمة
+ROW_CHUNK = 256
+POOL_CHUNK = 4096
+
+
+def nearest_neighbors(dist, k):
+    """Each city's k nearest other cities, closest first, as an (n, k) int32 array."""
+    d = np.asarray(dist)
+    n = len(d)
+    k = max(0, min(k, n - 1))
+    out = np.empty((n, k), dtype=np.int32)
+    if k == 0:
+        return out
+    for start in range(0, n, BLOCK_ROWS):
+        rows = np.arange(start, min(start + BLOCK_ROWS, n))
+        block = np.array(d[rows], dtype=np.float64)
+        block[np.arange(len(rows)), rows] = np.inf
+        idx = np.argpartition(block, k - 1, axis=1)[:, :k]
+        order = np.argsort(np.take_along_axis(block, idx, axis=1), axis=1)
+        out[rows] = np.take_along_axis(idx, order, axis=1)
+    return out
+
+
+def _top_k(xyz, rows, pool, k):
+    # أقرب k من pool لكل نقطة في rows بالـ chord²، مع شيل النقطة نفسها؛ بيرجع (idx, d2) مترتبين
+    idx_out = np.empty((len(rows), k), dtype=np.int64)
+    d2_out = np.empty((len(rows), k))
+    for r in range(0, len(rows), ROW_CHUNK):
+        part = rows[r:r + ROW_CHUNK]
+        q = xyz[part]
+        sel = np.arange(len(part))[:, None]
+        best_d = best_i = None
+        for c in range(0, len(pool), POOL_CHUNK):
+            cols = pool[c:c + POOL_CHUNK]
+            diff = q[:, None, :] - xyz[cols][None, :, :]
+            d2 = np.einsum("ijk,ijk->ij", diff, diff)
+            d2[part[:, None] == cols] = np.inf
+            idx = np.broadcast_to(cols, d2.shape)
+            if best_d is not None:
+                d2 = np.concatenate((best_d, d2), axis=1)
+                idx = np.concatenate((best_i, idx), axis=1)
+            keep = np.argpartition(d2, k - 1, axis=1)[:, :k]
+            best_d, best_i = d2[sel, keep], idx[sel, keep]
+        order = np.argsort(best_d, axis=1)
+        idx_out[r:r + len(part)] = best_i[sel, order]
+        d2_out[r:r + len(part)] = best_d[sel, order]
+    return idx_out, d2_out
+
+
+def knn_graph(coords, k, per_cell=None):
+    """Each city's k nearest other cities by great-circle distance, closest first, as (n, k) int32.
+
+    Points go into a uniform grid over their unit-sphere positions (one O(n log n) sort),
+    and each cell is compared only with its 27 surrounding cells. A point whose k-th
+    neighbour is farther than the edge of that block is redone against every point,
+    so the result is exact.
+    """
+    xyz = unit_vectors(coords)
+    n = len(xyz)
+    k = max(0, min(k, n - 1))
+    out = np.empty((n, k), dtype=np.int32)
+    if k == 0:
+        return out
+    if n <= 2 * BLOCK_ROWS:
+        out[:] = _top_k(xyz, np.arange(n), np.arange(n), k)[0]
+        return out
+
+    # نفس حساب h في SphereGrid: النقط على سطح، فالمساحة تقريباً حاصل ضرب أكبر بعدين
+    lo = xyz.min(axis=0)
+    ext = np.sort(xyz.max(axis=0) - lo)
+    h = max(math.sqrt(max(ext[1] * ext[2], 1e-12) * (per_cell or 2 * k) / n), 1e-9)
+    scaled = (xyz - lo) / h
+    ijk = np.floor(scaled).astype(np.int64)
+    dims = ijk.max(axis=0) + 1
+    key = (ijk[:, 0] * dims[1] + ijk[:, 1]) * dims[2] + ijk[:, 2]
+    order = np.argsort(key, kind="stable")
+    _, starts, counts = np.unique(key[order], return_index=True, return_counts=True)
+    cells = {tuple(c): (s, s + m) for c, s, m in zip(ijk[order[starts]].tolist(), starts.tolist(), counts.tolist())}
+    around = [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)]
+
+    kth = np.empty(n)
+    for (cx, cy, cz), (s, e) in cells.items():
+        rows = order[s:e]
+        spans = [cells.get((cx + dx, cy + dy, cz + dz)) for dx, dy, dz in around]
+        pool = np.concatenate([order[a:b] for a, b in filter(None, spans)])
+        if len(pool) - 1 < k:
+            kth[rows] = np.inf
+            continue
+        idx, d2 = _top_k(xyz, rows, pool, k)
+        out[rows] = idx
+        kth[rows] = d2[:, -1]
+
+    # أي نقطة برا الـ 3x3x3 block على مسافة على الأقل h * (1 + أقرب حافة للنقطة جوه خليتها)
+    frac = scaled - ijk
+    margin = h * (1.0 + np.minimum(frac, 1.0 - frac).min(axis=1))
+    redo = np.flatnonzero(kth > margin * margin)
+    if len(redo):
+        out[redo] = _top_k(xyz, redo, np.arange(n), k)[0]
+    return out
+
+
+def quadrant_neighbors(coords, k, pool=None):
+    """k neighbours per city, up to k // 4 of them from each quadrant (NE, NW, SE, SW) around it.
+
+    Quadrants that come up short are topped up with the nearest remaining cities. The
+    quadrant picks come from the 3k nearest (or `pool`), so a quadrant that is empty that
+    close by stays empty. Rows are ordered closest first like knn_graph.
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    n = len(coords)
+    k = max(0, min(k, n - 1))
+    if pool is None:
+        pool = knn_graph(coords, 3 * k)
+    if k == 0 or pool.shape[1] <= k:
+        return pool[:, :k].astype(np.int32)
+    delta = coords[pool] - coords[:, None, :]
+    quadrant = (delta[..., 0] < 0) * 2 + (delta[..., 1] < 0)
+    chosen = np.zeros(pool.shape, dtype=bool)
+    for q in range(4):
+        mask = quadrant == q
+        chosen |= mask & (np.cumsum(mask, axis=1) <= k // 4)
+    # الـ chosen الأول وبعدين الأقرب، والـ pool مترتب بالمسافة أصلاً فترتيب الـ columns = ترتيب المسافة
+    width = pool.shape[1]
+    take = np.sort(np.argsort(np.where(chosen, 0, width) + np.arange(width), axis=1)[:, :k], axis=1)
+    return np.take_along_axis(pool, take, axis=1).astype(np.int32)
+
+
+def candidate_graph(dist=None, coords=None, k=8, quadrant=False):
+    """Shared (n, k) int32 candidate lists for construction and local search.
+
+    With (lat, lon) coords it is built in O(n log n) from a spatial grid and can be
+    quadrant-balanced; with only a matrix it falls back to nearest_neighbors (O(n^2),
+    but the matrix already costs that much), and quadrant=True raises ValueError.
+    """
+    if coords is not None:
+        return quadrant_neighbors(coords, k) if quadrant else knn_graph(coords, k)
+    if dist is None:
+        raise ValueError("candidate_graph() needs coords or dist")
+    if quadrant:
+        # الـ quadrants محتاجة اتجاهات، والـ matrix لوحدها مفيهاش غير مسافات
+        raise ValueError("quadrant=True needs (lat, lon) coords; matrix-only and EUC_2D instances "
+                         "only support plain k-nearest candidates")
+    return nearest_neighbors(dist, k)
@@ -0,0 +1,270 @@
+"""Benchmark suite for every solver, with a stored baseline and a regression check.
+
+    python -m utils.comparison run --output results/latest.json
+    python -m utils.comparison compare results/baseline.json results/latest.json
+    python -m utils.comparison run --full --output results/baseline.json   # refresh the baseline
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import traceback
+from multiprocessing import Pool
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from utils.instances import load_instance
+from utils.solvers import solve
+
+QUICK_INSTANCES = ["egypt5", "egypt15", "egypt20", "random:50:1", "random:200:1", "random:1000:1"]
+FULL_INSTANCES = QUICK_INSTANCES + ["random:10000:1"]
+
+# (solver, أكبر n يتشغل عليه, parameters)؛ لو الـ solver متكرر بياخد أول سطر الـ n بتاعه تحته.
+# الـ exact solvers بتنفجر بعد 15-20 مدينة. الـ hill climbing بياخد ~20 ثانية للـ restart الواحد
+# على 1000 مدينة فمبيوصلش 10k. الـ annealing والـ tabu بياخدوا dist.tolist() (~4.5 GB على 10k)
+# والـ island GA أربع GAs، فواقفين عند 1000 برضه
+SUITE = [
+    ("ucs", 15, {}),
+    ("held_karp", 20, {}),
+    ("astar", 20, {}),
+    ("idastar", 15, {}),
+    ("branch_and_bound", 20, {}),
+    ("nn_2opt", 10000, {"seed": 1}),
+    ("ga", 10000, {"seed": 1}),
+    ("island_ga", 1000, {"seed": 1, "workers": 1}),
+    ("hill_climbing", 200, {"restarts": 20, "neighbourhood": "2opt"}),
+    ("hill_climbing", 1000, {"restarts": 2, "neighbourhood": "2opt"}),
+    ("annealing", 1000, {"time_limit": 2.0}),
+    ("tabu", 1000, {"time_limit": 2.0}),
+]
+EXACT = {"ucs", "held_karp", "astar", "idastar", "branch_and_bound"}
+
+# الحدود اللي بعدها نعتبر النتيجة regression
+COST_TOLERANCE = 0.01      # 1% أطول
+TIME_FACTOR = 1.5          # 50% أبطأ ...
+TIME_SLACK = 0.05          # ... وبفرق أكتر من 50ms (عشان الـ noise في الحاجات السريعة)
+MEMORY_FACTOR = 1.5
+MEMORY_SLACK = 5.0         # MB
+
+
+def _cpu_model():
+    # platform.processor() فاضية غالباً على Linux، فبنقرا /proc/cpuinfo لو موجود
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def _status_mb(field):
+    # VmRSS / VmHWM من /proc/self/status (Linux بس)
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _max_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux بيرجع KB و macOS بيرجع bytes
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def _memory_start():
+    """Baseline for _memory_growth, taken right before the solve."""
+    # الـ worker متعمل fork، فالـ ru_maxrss ممكن يكون الـ peak بتاع الـ parent.
+    # على Linux "5" في clear_refs بيرجّع الـ high-water mark للـ RSS الحالي
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return "VmHWM", _status_mb("VmRSS")
+    except OSError:
+        return "maxrss", _max_rss_mb()
+
+
+def _memory_growth(start):
+    """Peak RSS during the solve minus the RSS before it, in MB (None if unknown)."""
+    kind, base = start
+    peak = _status_mb("VmHWM") if kind == "VmHWM" else _max_rss_mb()
+    if base is None or peak is None:
+        return None
+    # من غير clear_refs ده lower bound: الـ solve لازم يعدّي الـ peak القديم عشان يتحسب
+    return max(0.0, peak - base)
+
+
+def _run_one(task):
+    # كل task في process جديدة (maxtasksperchild=1)
+    spec, solver, params = task
+    record = {"instance": spec, "solver": solver, "params": params, "n": None}
+    try:
+        instance = load_instance(spec)
+        start = _memory_start()
+        result = solve(solver, coords=instance["coords"], dist=instance["dist"],
+                       metric=instance["metric"], **params)
+        record["peak_memory_mb"] = _memory_growth(start)
+        stats = result["stats"]
+        record.update(n=result["n"], cost=result["cost"], time=result["time"],
+                      nodes_expanded=stats.get("nodes_expanded"), stats=stats)
+    except Exception as exc:
+        # solver واحد بايظ ميوقفش الـ suite كله
+        record["error"] = f"{type(exc).__name__}: {exc}"
+        record["traceback"] = traceback.format_exc()
+    return record
+
+
+def suite_tasks(instances, solvers=None):
+    tasks = []
+    for spec in instances:
+        n = _size(spec)
+        seen = set()
+        for solver, max_n, params in SUITE:
+            if (solvers is None or solver in solvers) and n <= max_n and solver not in seen:
+                seen.add(solver)
+                tasks.append((spec, solver, params))
+    return tasks
+
+
+def _size(spec):
+    if spec.startswith("random:"):
+        return int(spec.split(":")[1])
+    if spec.startswith("egypt"):
+        return int(spec[len("egypt"):])
+    instance = load_instance(spec)
+    return len(instance["coords"] if instance["coords"] is not None else instance["dist"])
+
+
+def add_gaps(records, reference=()):
+    # best-known = أحسن cost اتشاف للـ instance في الـ run دي أو في الـ reference (الـ baseline)
+    best = {}
+    for record in list(records) + list(reference):
+        if record.get("cost") is not None:
+            best[record["instance"]] = min(best.get(record["instance"], float("inf")), record["cost"])
+    for record in records:
+        if record.get("cost") is not None:
+            known = best[record["instance"]]
+            record["best_known"] = known
+            record["gap_pct"] = 100.0 * (record["cost"] - known) / known if known else 0.0
+    return records
+
+
+def run_suite(instances, solvers=None, progress=True):
+    tasks = suite_tasks(instances, solvers)
+    records = []
+    with Pool(1, maxtasksperchild=1) as pool:
+        for record in pool.imap(_run_one, tasks):
+            records.append(record)
+            if progress:
+                if "error" in record:
+                    print(f"{record['instance']:>16} {record['solver']:>16}  {record['error']}", file=sys.stderr)
+                else:
+                    print(f"{record['instance']:>16} {record['solver']:>16}  cost {record['cost']:12.2f}"
+                          f"  time {record['time']:8.3f}s  peak {record['peak_memory_mb'] or 0:7.1f} MB",
+                          file=sys.stderr)
+    add_gaps(records)
+    return {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "cpus": os.cpu_count(), "cpu_model": _cpu_model()},
+        "records": records,
+    }
+
+
+def compare(baseline, current):
+    """Regressions of `current` against `baseline`, as a list of human-readable strings."""
+    base = {(r["instance"], r["solver"]): r for r in baseline["records"]}
+    add_gaps(current["records"], baseline["records"])
+    problems = []
+    for record in current["records"]:
+        key = (record["instance"], record["solver"])
+        old = base.get(key)
+        label = f"{record['solver']} on {record['instance']}"
+        if old is None:
+            continue
+        if "error" in record and "error" not in old:
+            problems.append(f"{label}: now fails ({record['error']})")
+            continue
+        if "error" in record or "error" in old:
+            continue
+        if record["solver"] in EXACT and record["cost"] > old["cost"] + 1e-6:
+            problems.append(f"{label}: exact solver cost went from {old['cost']:.2f} to {record['cost']:.2f}")
+        elif record["cost"] > old["cost"] * (1 + COST_TOLERANCE):
+            problems.append(f"{label}: cost {old['cost']:.2f} -> {record['cost']:.2f}")
+        if record["time"] > old["time"] * TIME_FACTOR and record["time"] - old["time"] > TIME_SLACK:
+            problems.append(f"{label}: time {old['time']:.3f}s -> {record['time']:.3f}s")
+        if (record.get("peak_memory_mb") is not None and old.get("peak_memory_mb") is not None
+                and record["peak_memory_mb"] > old["peak_memory_mb"] * MEMORY_FACTOR
+                and record["peak_memory_mb"] - old["peak_memory_mb"] > MEMORY_SLACK):
+            problems.append(f"{label}: peak memory {old['peak_memory_mb']:.1f} MB -> "
+                            f"{record['peak_memory_mb']:.1f} MB")
+        if record.get("nodes_expanded") is not None and old.get("nodes_expanded") is not None \
+                and record["nodes_expanded"] > old["nodes_expanded"] * TIME_FACTOR:
+            problems.append(f"{label}: nodes expanded {old['nodes_expanded']} -> {record['nodes_expanded']}")
+    return problems
+
+
+def print_table(report):
+    print(f"{'instance':>16} {'solver':>16} {'cost':>12} {'gap %':>7} {'time s':>9} {'peak MB':>8} {'nodes':>9}")
+    for r in report["records"]:
+        if "error" in r:
+            print(f"{r['instance']:>16} {r['solver']:>16}  {r['error']}")
+            continue
+        nodes = "" if r.get("nodes_expanded") is None else r["nodes_expanded"]
+        print(f"{r['instance']:>16} {r['solver']:>16} {r['cost']:12.2f} {r['gap_pct']:7.2f} {r['time']:9.3f} "
+              f"{r['peak_memory_mb'] or 0:8.1f} {nodes:>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark all TSP solvers and compare against a baseline.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="run the suite")
+    run.add_argument("--full", action="store_true", help="include the 10k-city instance")
+    run.add_argument("--solver", action="append", help="only these solvers (repeatable)")
+    run.add_argument("--instance", action="append", help="instead of the built-in instance list (repeatable)")
+    run.add_argument("--output", help="write the report as JSON")
+    run.add_argument("--baseline", help="also compare the run against this report")
+    cmp_ = sub.add_parser("compare", help="compare two stored reports")
+    cmp_.add_argument("baseline")
+    cmp_.add_argument("current")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        instances = args.instance or (FULL_INSTANCES if args.full else QUICK_INSTANCES)
+        report = run_suite(instances, args.solver)
+        if args.output:
+            os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=1)
+        print_table(report)
+        if not args.baseline:
+            return 0
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        current = report
+    else:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+
+    problems = compare(baseline, current)
+    for problem in problems:
+        print("REGRESSION:", problem)
+    if not problems:
+        print("No regressions against the baseline.")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
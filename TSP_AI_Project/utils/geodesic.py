@@ -0,0 +1,85 @@
+import math
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+# عدد الصفوف اللي بتتحسب مرة واحدة عشان الذاكرة المؤقتة متكبرش مع n كبيرة
+BLOCK_ROWS = 1024
+
+
+def to_radians(coords):
+    """Convert (lat, lon) degrees to radian arrays plus cos(lat), computed once per instance."""
+    pts = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    lat = np.radians(pts[:, 0])
+    lon = np.radians(pts[:, 1])
+    return lat, lon, np.cos(lat)
+
+
+def unit_vectors(coords):
+    """3-D unit-sphere coordinates, shape (n, 3)."""
+    lat, lon, coslat = to_radians(coords)
+    return np.column_stack((coslat * np.cos(lon), coslat * np.sin(lon), np.sin(lat)))
+
+
+def chord_to_km(chord):
+    # |u1 - u2| = 2 sin(theta / 2)  =>  arc = 2R asin(chord / 2); no cancellation for close points
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(np.asarray(chord) * 0.5, 1.0))
+
+
+def _block(xyz, rows, cols):
+    sq = np.zeros((len(rows), len(cols)))
+    for axis in range(3):
+        diff = xyz[rows, axis][:, None] - xyz[cols, axis][None, :]
+        sq += diff * diff
+    return chord_to_km(np.sqrt(sq))
+
+
+def distance_matrix(coords, dtype=np.float64):
+    """Full n x n haversine matrix (km), built in vectorized row blocks."""
+    xyz = unit_vectors(coords)
+    n = len(xyz)
+    out = np.empty((n, n), dtype=dtype)
+    cols = np.arange(n)
+    for start in range(0, n, BLOCK_ROWS):
+        rows = cols[start:start + BLOCK_ROWS]
+        out[rows] = _block(xyz, rows, cols)
+    np.fill_diagonal(out, 0)
+    return out
+
+
+class GeoDistance:
+    """Haversine distances computed on demand, indexed like the n x n matrix.
+
+    d[i, j] with two ints is one distance; d[rows, cols] with arrays broadcasts.
+    That is all the local-search moves and tour_length need, so coordinate-only
+    instances run without the matrix (n^2 * 8 bytes, 75 GiB at 100k cities).
+    """
+
+    def __init__(self, coords):
+        self.xyz = unit_vectors(coords)
+        self.x, self.y, self.z = (self.xyz[:, axis].tolist() for axis in range(3))
+        self.shape = (len(self.xyz), len(self.xyz))
+
+    def __len__(self):
+        return len(self.xyz)
+
+    def __getitem__(self, key):
+        i, j = key
+        if isinstance(i, (int, np.integer)) and isinstance(j, (int, np.integer)):
+            # scalar بـ math على lists أسرع بكتير من numpy على 3 أرقام
+            x, y, z = self.x, self.y, self.z
+            chord = math.sqrt((x[i] - x[j]) ** 2 + (y[i] - y[j]) ** 2 + (z[i] - z[j]) ** 2)
+            return 2 * EARTH_RADIUS_KM * math.asin(min(chord * 0.5, 1.0))
+        diff = self.xyz[np.asarray(i)] - self.xyz[np.asarray(j)]
+        return chord_to_km(np.sqrt((diff * diff).sum(axis=-1)))
+
+
+def as_distance(dist):
+    # GeoDistance بيفضل زي ما هو (np.asarray عليه هتعمل object array)، أي حاجة تانية بتبقى ndarray
+    return dist if isinstance(dist, GeoDistance) else np.asarray(dist)
+
+
+def tour_length(tour, dist):
+    """Closed-tour length using a precomputed matrix (or a GeoDistance)."""
+    t = np.asarray(tour, dtype=np.intp)
+    return float(as_distance(dist)[t, np.roll(t, -1)].sum())
@@ -0,0 +1,208 @@
+import json
+import os
+import random
+import re
+import sys
+
+import numpy as np
+
+from utils.geodesic import distance_matrix
+
+# نفس مجموعات مصر اللي في AI_Algorithm_A_Star_Search/cities.py
+_CITIES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "AI_Algorithm_A_Star_Search")
+
+
+def egypt_group(n):
+    sys.path.insert(0, _CITIES_DIR)
+    from cities import group_5, group_15, group_20
+    group = {5: group_5, 15: group_15, 20: group_20}[n]
+    return list(group.keys()), np.array(list(group.values()), dtype=np.float64)
+
+
+def random_instance(n, seed=42):
+    # مدن عشوائية جوه مصر، زي main() في branch_and_bound.py
+    rng = random.Random(seed)
+    return np.array([[rng.uniform(22.0, 31.5), rng.uniform(25.0, 35.0)] for _ in range(n)])
+
+
+# حجم الـ chunk اللي بيتقرا من الملف مرة واحدة؛ الملف مبيتقريش كله في string واحدة
+CHUNK_BYTES = 1 << 23
+# أول سطر بيبدأ بحرف بعد section أرقام = keyword جديدة أو EOF
+_KEYWORD = re.compile(r"^[ \t]*[A-Za-z]", re.M)
+
+
+def _read_numbers(f, pending, dtype=np.float64):
+    """Numbers of one TSPLIB section, read in chunks; returns (array, text after the section).
+
+    np.fromstring parses in C, so no Python object is made per number.
+    """
+    parts = []
+    buf = pending
+    while True:
+        chunk = f.read(CHUNK_BYTES)
+        data = buf + chunk
+        cut = data.rfind("\n") + 1 if chunk else len(data)
+        complete, buf = data[:cut], data[cut:]
+        m = _KEYWORD.search(complete)
+        if m:
+            parts.append(np.fromstring(complete[:m.start()], dtype=dtype, sep=" "))
+            return np.concatenate(parts), complete[m.start():] + buf
+        parts.append(np.fromstring(complete, dtype=dtype, sep=" "))
+        if not chunk:
+            return np.concatenate(parts), ""
+
+
+def geo_to_degrees(x):
+    # TSPLIB GEO: DDD.MM يعني درجات ودقايق، مش كسور عشرية
+    deg = np.trunc(x)
+    return deg + (x - deg) * 100.0 / 60.0
+
+
+def euc_2d_matrix(xy):
+    """TSPLIB EUC_2D distances (rounded to the nearest integer) as an (n, n) float64 matrix."""
+    xy = np.asarray(xy, dtype=np.float64)
+    out = np.empty((len(xy), len(xy)))
+    for start in range(0, len(xy), 1024):
+        block = xy[start:start + 1024]
+        out[start:start + len(block)] = np.rint(np.sqrt(((block[:, None, :] - xy[None, :, :]) ** 2).sum(axis=2)))
+    return out
+
+
+def _explicit_matrix(weights, n, fmt):
+    dist = np.zeros((n, n))
+    if fmt == "FULL_MATRIX":
+        return weights[:n * n].reshape(n, n).astype(np.float64)
+    upper = fmt.startswith("UPPER")
+    diag = "DIAG" in fmt
+    # ROW على الـ upper = COL على الـ lower لنفس المثلث
+    rows, cols = np.triu_indices(n, 0 if diag else 1) if upper else np.tril_indices(n, 0 if diag else -1)
+    if fmt.endswith("_COL"):
+        rows, cols = cols, rows
+        order = np.lexsort((cols, rows))
+        rows, cols = rows[order], cols[order]
+    dist[rows, cols] = weights[:len(rows)]
+    dist[cols, rows] = weights[:len(rows)]
+    return dist
+
+
+def load_tsplib(path):
+    """TSPLIB .tsp file: GEO / EUC_2D node coordinates or an EXPLICIT weight matrix.
+
+    GEO coordinates are converted to decimal (lat, lon) degrees and measured with
+    haversine like the rest of the project, so distances are close to but not exactly
+    TSPLIB's integer GEO distances. EUC_2D keeps the planar coordinates and sets
+    metric to "euc_2d".
+    """
+    header = {}
+    coords = weights = dist = None
+    with open(path) as f:
+        pending = ""
+        while True:
+            if not pending:
+                pending = f.readline()
+                if not pending:
+                    break
+            line, _, pending = pending.partition("\n")
+            keyword = line.strip()
+            upper = keyword.upper()
+            if not upper.endswith("_SECTION"):
+                if ":" in keyword:
+                    key, _, value = keyword.partition(":")
+                    header[key.strip().upper()] = value.strip()
+                continue
+            # DISPLAY_DATA_SECTION وغيرها بتتقرا وتترمي
+            numbers, pending = _read_numbers(f, pending)
+            if upper == "NODE_COORD_SECTION":
+                coords = numbers.reshape(-1, 3)[:, 1:]
+            elif upper == "EDGE_WEIGHT_SECTION":
+                weights = numbers
+
+    n = int(header.get("DIMENSION", 0)) or (len(coords) if coords is not None else 0)
+    kind = header.get("EDGE_WEIGHT_TYPE", "EUC_2D").upper()
+    metric = "geo"
+    if kind == "EXPLICIT":
+        dist = _explicit_matrix(weights, n, header.get("EDGE_WEIGHT_FORMAT", "FULL_MATRIX").upper())
+        coords = None
+    elif kind == "GEO":
+        coords = geo_to_degrees(coords)
+    elif kind == "EUC_2D":
+        metric = "euc_2d"
+    else:
+        raise ValueError(f"unsupported EDGE_WEIGHT_TYPE {kind!r} in {path}")
+    name = header.get("NAME", os.path.splitext(os.path.basename(path))[0])
+    return {"name": name, "names": None, "coords": coords, "dist": dist, "metric": metric}
+
+
+_LAT_NAMES = ("lat", "latitude", "y")
+_LON_NAMES = ("lon", "lng", "long", "longitude", "x")
+
+
+def load_csv(path, dtype=np.float64):
+    """CSV of cities, one per row: lat,lon (column order taken from a header if there is one)."""
+    with open(path) as f:
+        first = f.readline()
+    fields = [c.strip().strip('"').lower() for c in first.split(",")]
+    try:
+        [float(c) for c in fields[:2]]
+        skip, lat_col, lon_col = 0, 0, 1
+    except ValueError:
+        skip = 1
+        lat_col = next((i for i, c in enumerate(fields) if c in _LAT_NAMES), 0)
+        lon_col = next((i for i, c in enumerate(fields) if c in _LON_NAMES), 1)
+    coords = np.loadtxt(path, delimiter=",", skiprows=skip, usecols=(lat_col, lon_col), dtype=dtype, ndmin=2)
+    name = os.path.splitext(os.path.basename(path))[0]
+    return {"name": name, "names": None, "coords": coords, "dist": None, "metric": "geo"}
+
+
+def load_instance(spec):
+    """Instance from a spec string; returns a dict with name, names, coords, dist and metric.
+
+    Specs: "egypt5" / "egypt15" / "egypt20", "random:<n>[:<seed>]", a TSPLIB .tsp file,
+    a .csv of lat,lon rows, or a .json file holding {"coords": [[lat, lon], ...]} or
+    {"matrix": [[...], ...]} (plus optional "name" and "names").
+    """
+    if spec.startswith("egypt"):
+        names, coords = egypt_group(int(spec[len("egypt"):]))
+        return {"name": spec, "names": names, "coords": coords, "dist": distance_matrix(coords), "metric": "geo"}
+    if spec.startswith("random:"):
+        parts = spec.split(":")
+        n, seed = int(parts[1]), int(parts[2]) if len(parts) > 2 else 42
+        coords = random_instance(n, seed)
+        return {"name": spec, "names": None, "coords": coords, "dist": None, "metric": "geo"}
+    ext = os.path.splitext(spec)[1].lower()
+    if ext == ".tsp":
+        return load_tsplib(spec)
+    if ext == ".csv":
+        return load_csv(spec)
+
+    with open(spec) as f:
+        data = json.load(f)
+    name = data.get("name", os.path.splitext(os.path.basename(spec))[0])
+    if "matrix" in data:
+        dist = np.array(data["matrix"], dtype=np.float64)
+        return {"name": name, "names": data.get("names"), "coords": None, "dist": dist, "metric": "geo"}
+    coords = np.array(data["coords"], dtype=np.float64)
+    return {"name": name, "names": data.get("names"), "coords": coords, "dist": None, "metric": "geo"}
+
+
+INSTANCE_EXTENSIONS = (".json", ".tsp", ".csv")
+
+
+def instance_specs(paths):
+    """Expand directories (every .json/.tsp/.csv inside) and manifests (.txt, one spec per line)."""
+    specs = []
+    for path in paths:
+        if os.path.isdir(path):
+            specs += sorted(os.path.join(path, f) for f in os.listdir(path) if f.lower().endswith(INSTANCE_EXTENSIONS))
+        elif path.endswith(".txt") and os.path.isfile(path):
+            base = os.path.dirname(path)
+            with open(path) as f:
+                for line in f:
+                    line = line.strip()
+                    if not line or line.startswith("#"):
+                        continue
+                    is_file = not (line.startswith("egypt") or line.startswith("random:"))
+                    specs.append(os.path.join(base, line) if is_file else line)
+        else:
+            specs.append(path)
+    return specs
@@ -0,0 +1,99 @@
+import os
+import sys
+import time
+from collections import deque
+
+from utils.candidates import nearest_neighbors
+from utils.geodesic import as_distance
+from utils.tour import positions, reverse_segment
+
+
+def lk_requested():
+    """True with --lk on the command line or TSP_LK set (not "0"): the interactive scripts polish with LK."""
+    return "--lk" in sys.argv or os.environ.get("TSP_LK", "0") not in ("", "0")
+
+
+def lin_kernighan(tour, dist, neighbors=None, k=8, max_depth=12, breadth=(5, 3, 1), time_limit=None):
+    """LK-style variable-depth improvement of an existing tour.
+
+    Each step is a sequential 2-opt move (remove t1-t2, add t2-t3, remove t3-t4,
+    close t4-t1) taken from the candidate lists under the positive-gain rule.
+    breadth[i] alternatives are backtracked at depth i (1 past the tuple), and
+    the chain stops at max_depth. A chain is kept as soon as closing it gains.
+    Works on any constructor's output: NN, the GA's best tour, a hill-climbing route.
+    """
+    d = as_distance(dist)
+    n = len(tour)
+    tour = list(tour)
+    if n < 5:
+        return tour
+    if neighbors is None:
+        neighbors = nearest_neighbors(d, k)
+    nbr = neighbors.tolist()
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+
+    pos = positions(tour)
+
+    def after(x, forward):
+        return tour[(pos[x] + 1) % n] if forward else tour[pos[x] - 1]
+
+    def flip(t1, a, b):
+        # اقلب المسار a..b اللي جنب t1 (a جار t1 ومن غير ما يعدي على t1)
+        if tour[(pos[t1] + 1) % n] == a:
+            reverse_segment(tour, pos, pos[a], pos[b])
+        else:
+            reverse_segment(tour, pos, pos[b], pos[a])
+
+    def step(t1, t2, gain, depth, added, removed, touched):
+        # t2 جار t1؛ gain = مجموع اللي اتشال - مجموع اللي اتضاف من غير وصلة القفل (t2, t1)
+        forward = after(t1, True) == t2
+        candidates = []
+        for t3 in nbr[t2]:
+            g1 = gain - d[t2, t3]
+            if g1 <= 0:
+                break
+            if t3 == t1 or (min(t2, t3), max(t2, t3)) in removed:
+                continue
+            t4 = after(t3, not forward)
+            if t4 == t2 or (min(t3, t4), max(t3, t4)) in added:
+                continue
+            candidates.append((d[t3, t4] - d[t2, t3], t3, t4))
+        candidates.sort(reverse=True)
+        width = breadth[depth] if depth < len(breadth) else 1
+
+        for _, t3, t4 in candidates[:width]:
+            flip(t1, t2, t4)
+            new_gain = gain - d[t2, t3] + d[t3, t4]
+            if new_gain - d[t4, t1] > 1e-9:
+                touched.extend((t2, t3, t4))
+                return True
+            if depth + 1 < max_depth:
+                e_add, e_rem = (min(t2, t3), max(t2, t3)), (min(t3, t4), max(t3, t4))
+                added.add(e_add)
+                removed.add(e_rem)
+                if step(t1, t4, new_gain, depth + 1, added, removed, touched):
+                    touched.extend((t2, t3, t4))
+                    return True
+                added.discard(e_add)
+                removed.discard(e_rem)
+            flip(t1, t4, t2)  # undo: t4 جار t1 دلوقتي
+        return False
+
+    queue = deque(tour)
+    queued = [True] * n
+    while queue:
+        if deadline is not None and time.perf_counter() > deadline:
+            break
+        t1 = queue.popleft()
+        queued[t1] = False
+        for forward in (True, False):
+            t2 = after(t1, forward)
+            touched = [t1]
+            if step(t1, t2, d[t1, t2], 0, set(), {(min(t1, t2), max(t1, t2))}, touched):
+                for city in touched:
+                    if not queued[city]:
+                        queued[city] = True
+                        queue.append(city)
+                break
+
+    return tour
@@ -0,0 +1,33 @@
+from array import array
+
+
+class NodeArena:
+    """Parent-pointer store for search nodes; a node is just an index into three flat arrays."""
+
+    __slots__ = ("parent", "city", "mask")
+
+    def __init__(self):
+        self.parent = array("i")
+        self.city = array("h")
+        # visited/unvisited bitmask, so exact searches are limited to 63 cities
+        self.mask = array("q")
+
+    def __len__(self):
+        return len(self.parent)
+
+    def add(self, parent, city, mask):
+        self.parent.append(parent)
+        self.city.append(city)
+        self.mask.append(mask)
+        return len(self.parent) - 1
+
+    def path(self, node_id):
+        path = []
+        while node_id != -1:
+            path.append(self.city[node_id])
+            node_id = self.parent[node_id]
+        path.reverse()
+        return path
+
+    def nbytes(self):
+        return sum(buf.itemsize * len(buf) for buf in (self.parent, self.city, self.mask))
@@ -0,0 +1,312 @@
+import inspect
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+from utils.cache import cache_key, fingerprint
+from utils.candidates import candidate_graph
+from utils.geodesic import GeoDistance, distance_matrix, tour_length
+from utils.instances import euc_2d_matrix
+from utils.lin_kernighan import lin_kernighan
+from utils.stats import SolverStats
+
+# واجهة واحدة لكل الخوارزميات: coords أو matrix داخلين، و tour + cost + stats خارجين
+# كل adapter بياخد (coords, dist, stats) وبعدين الـ parameters بتاعته، وبيرجع الـ tour بس
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+SOLVERS = {}
+# بيتزود لما الـ solver يتغير بشكل يغير نتايجه، فالنتايج القديمة في الـ cache تتمسح
+SOLVER_VERSIONS = {}
+# solvers بتشتغل بـ GeoDistance (مسافات on demand من الـ coords) من غير الـ n x n matrix
+COORDINATE_SOLVERS = set()
+# أكبر matrix بنبنيها؛ بعد كده solve() بيرفض قبل ما يحجز الذاكرة
+MAX_MATRIX_BYTES = 4 * 1024 ** 3
+# تحت الحجم ده الـ matrix أسرع حتى للـ COORDINATE_SOLVERS (ع 2000 مدينة: 6 ث بدل 9، وع 10000: 14 ث بدل 9.5)
+LAZY_MATRIX_BYTES = 64 * 1024 ** 2
+# الـ hill climbing بيقصر الـ moves على candidate lists بالحجم ده من أول CANDIDATE_MIN_CITIES مدينة
+CANDIDATE_K = 10
+CANDIDATE_MIN_CITIES = 500
+# parameters بتغير السرعة بس مش الـ tour (الـ restarts / islands نتيجتها واحدة بأي عدد workers)،
+# فمبتدخلش في الـ cache key
+SPEED_ONLY_PARAMS = ("workers",)
+
+
+def _solver(name, version=1, coordinates=False):
+    def register(fn):
+        SOLVERS[name] = fn
+        SOLVER_VERSIONS[name] = version
+        if coordinates:
+            COORDINATE_SOLVERS.add(name)
+        return fn
+    return register
+
+
+def _use_dir(dirname):
+    # كل خوارزمية في فولدر لوحدها وبتعمل import لملفات جنبها
+    path = os.path.join(ROOT, dirname)
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+def _closed_to_open(path):
+    return list(path[:-1]) if len(path) > 1 and path[0] == path[-1] else list(path)
+
+
+@_solver("ucs")
+def _ucs(coords, dist, stats, start=0):
+    _use_dir("AlgoUCS")
+    from UCS_Algorithm import ucs_tsp
+    path, _ = ucs_tsp(dist.tolist(), start, stats=stats)
+    return _closed_to_open(path)
+
+
+@_solver("held_karp")
+def _held_karp(coords, dist, stats, start=0, workers=1):
+    _use_dir("AlgoUCS")
+    from held_karp import held_karp, held_karp_memory_estimate
+    stats.update({"states": (len(dist) - 1) << max(len(dist) - 2, 0),
+                  "estimated_memory_mb": held_karp_memory_estimate(len(dist)) / 1024 ** 2})
+    path, _ = held_karp(dist, start, workers=workers)
+    return _closed_to_open(path)
+
+
+@_solver("astar")
+def _astar(coords, dist, stats, start=0):
+    _use_dir("AI_Algorithm_A_Star_Search")
+    from a_star import AStarTSP
+    solver = AStarTSP({i: None for i in range(len(dist))}, dist=dist)
+    path, _ = solver.solve(start, stats=stats)
+    return _closed_to_open(path)
+
+
+@_solver("idastar")
+def _idastar(coords, dist, stats, start=0, memory_limit_mb=64):
+    _use_dir("AI_Algorithm_A_Star_Search")
+    from ida_star import IDAStarTSP
+    solver = IDAStarTSP({i: None for i in range(len(dist))}, dist=dist, memory_limit_mb=memory_limit_mb)
+    path, _ = solver.solve(start, stats=stats)
+    return _closed_to_open(path)
+
+
+@_solver("branch_and_bound")
+def _branch_and_bound(coords, dist, stats, start=0, time_limit=None):
+    _use_dir("Branch_and_Bound")
+    from branch_and_bound import branch_and_bound_tsp
+    path, _, _ = branch_and_bound_tsp(dist, start, time_limit=time_limit, stats=stats)
+    return _closed_to_open(path)
+
+
+@_solver("nn_2opt", version=2, coordinates=True)
+def _nn_2opt(coords, dist, stats, seed=None, k=3, moves=("2opt", "oropt", "or3opt", "lk"), candidates=8,
+             quadrant=False, lk_time_limit=None):
+    _use_dir("TSP_Nearest_Neighbor_2_opt")
+    from Map import local_search, nearest_neighbor_random
+    with stats.phase("candidates"):
+        # candidate graph واحد للـ construction وكل الـ local search moves
+        neighbors = candidate_graph(dist, coords, candidates, quadrant)
+    random.seed(seed)
+    with stats.phase("construction"):
+        tour = nearest_neighbor_random(dist, k=k, coords=None if coords is None else coords.tolist(),
+                                       neighbors=neighbors)
+    if isinstance(moves, str):
+        moves = moves.split(",")
+    return local_search(tour, dist, moves=tuple(moves), stats=stats, neighbors=neighbors,
+                        lk_time_limit=lk_time_limit)
+
+
+def _polish(tour, coords, dist, stats, lk, lk_time_limit, neighbors=None, k=8):
+    # LK اختياري بعد أي solver (lk=True)، بـ time limit لو اتحدد
+    if not lk or len(tour) < 5:
+        return tour
+    if neighbors is None:
+        with stats.phase("candidates"):
+            neighbors = candidate_graph(dist, coords, k)
+    with stats.phase("lk"):
+        return lin_kernighan(tour, dist, neighbors=neighbors, time_limit=lk_time_limit)
+
+
+def _ga_neighbors(coords, dist, stats, greedy_fraction, k):
+    # الـ candidate graph محتاجينه بس لو فيه greedy seeding
+    if greedy_fraction <= 0:
+        return None
+    with stats.phase("candidates"):
+        return candidate_graph(dist, coords, k)
+
+
+@_solver("ga")
+def _ga(coords, dist, stats, seed=None, pop_size=120, generations=500, crossover_type="ox",
+        mutation_type="swap", mutation_rate=0.02, greedy_fraction=0.0, k=8, lk=False, lk_time_limit=None):
+    _use_dir("Genetic_Algorithm")
+    from Genetic_Algorithm import genetic_algorithm
+    neighbors = _ga_neighbors(coords, dist, stats, greedy_fraction, k)
+    tour, _, _ = genetic_algorithm(dist, len(dist), pop_size=pop_size, generations=generations, seed=seed,
+                                   crossover_type=crossover_type, mutation_type=mutation_type,
+                                   mutation_rate=mutation_rate, stats=stats, neighbors=neighbors,
+                                   greedy_fraction=greedy_fraction)
+    return _polish(tour, coords, dist, stats, lk, lk_time_limit, neighbors, k)
+
+
+@_solver("island_ga")
+def _island_ga(coords, dist, stats, seed=None, islands=4, pop_size=120, generations=500, migration_interval=25,
+               migrants=2, topology="ring", workers=None, crossover_type="ox", mutation_type="swap",
+               mutation_rate=0.02, greedy_fraction=0.0, k=8, lk=False, lk_time_limit=None):
+    _use_dir("Genetic_Algorithm")
+    from island_model import island_model_ga
+    neighbors = _ga_neighbors(coords, dist, stats, greedy_fraction, k)
+    tour, _, _ = island_model_ga(dist, len(dist), islands=islands, pop_size=pop_size, generations=generations,
+                                 migration_interval=migration_interval, migrants=migrants, topology=topology,
+                                 workers=workers, seed=seed, crossover_type=crossover_type,
+                                 mutation_type=mutation_type, mutation_rate=mutation_rate, stats=stats,
+                                 neighbors=neighbors, greedy_fraction=greedy_fraction)
+    return _polish(tour, coords, dist, stats, lk, lk_time_limit, neighbors, k)
+
+
+@_solver("hill_climbing", version=2)
+def _hill_climbing(coords, dist, stats, seed=42, restarts=50, workers=1, target_cost=None, time_limit=None,
+                   neighbourhood="swap", first_improvement=False, k=None, lk=False, lk_time_limit=None):
+    _use_dir("Hill_Climbing Algorithm")
+    from hill_climbing import parallel_restarts
+    # k=None: candidate lists بس من 500 مدينة وطالع (تحت كده الـ full scan رخيص)؛ k=0: full scan دايماً
+    if k is None:
+        k = CANDIDATE_K if len(dist) >= CANDIDATE_MIN_CITIES else 0
+    neighbors = None
+    if k:
+        with stats.phase("candidates"):
+            neighbors = candidate_graph(dist, coords, k)
+    tour, _, _ = parallel_restarts(dist.tolist(), restarts, seed=seed, workers=workers,
+                                   target_cost=target_cost, time_limit=time_limit, stats=stats,
+                                   neighbourhood=neighbourhood, first_improvement=first_improvement,
+                                   neighbors=neighbors)
+    return _polish(tour, coords, dist, stats, lk, lk_time_limit, neighbors)
+
+
+@_solver("annealing")
+def _annealing(coords, dist, stats, seed=42, time_limit=1.0, max_iterations=None, schedule="geometric",
+               neighbourhood="both", t_end_ratio=1e-3, reheat_after=None, reheat_ratio=0.5, lk=False,
+               lk_time_limit=None):
+    _use_dir("Hill_Climbing Algorithm")
+    from metaheuristics import simulated_annealing
+    tour, _ = simulated_annealing(dist.tolist(), random.Random(seed), time_limit=time_limit,
+                                  max_iterations=max_iterations, schedule=schedule, neighbourhood=neighbourhood,
+                                  t_end_ratio=t_end_ratio, reheat_after=reheat_after, reheat_ratio=reheat_ratio,
+                                  stats=stats)
+    return _polish(tour, coords, dist, stats, lk, lk_time_limit)
+
+
+@_solver("tabu")
+def _tabu(coords, dist, stats, seed=42, time_limit=1.0, max_iterations=None, tenure=None, lk=False,
+          lk_time_limit=None):
+    _use_dir("Hill_Climbing Algorithm")
+    from metaheuristics import tabu_search
+    tour, _ = tabu_search(dist.tolist(), random.Random(seed), time_limit=time_limit,
+                          max_iterations=max_iterations, tenure=tenure, stats=stats)
+    return _polish(tour, coords, dist, stats, lk, lk_time_limit)
+
+
+def solver_params(name):
+    """Keyword parameters solver `name` accepts."""
+    return list(inspect.signature(SOLVERS[name]).parameters)[3:]
+
+
+def matrix_memory_estimate(n):
+    return n * n * 8
+
+
+def _check_matrix_size(name, n):
+    needed = matrix_memory_estimate(n)
+    if needed > MAX_MATRIX_BYTES:
+        raise MemoryError(
+            f"{name} needs the full distance matrix: about {needed / 1024 ** 3:.2f} GiB for {n} cities "
+            f"(limit {MAX_MATRIX_BYTES / 1024 ** 3:.2f} GiB); solvers that work from (lat, lon) "
+            f"coordinates alone: {sorted(COORDINATE_SOLVERS)}"
+        )
+
+
+def _full_params(name, params):
+    # الـ defaults جوه الـ key، فـ solve("ga") و solve("ga", generations=500) نفس الـ entry
+    bound = inspect.signature(SOLVERS[name]).bind(None, None, None, **params)
+    bound.apply_defaults()
+    return {param: value for param, value in list(bound.arguments.items())[3:]
+            if param not in SPEED_ONLY_PARAMS}
+
+
+def _instance_fingerprint(name, coords, dist):
+    # الـ key على الـ matrix، فنفس الـ instance بـ coords أو matrix بس بيوصل لنفس الـ entry؛
+    # الـ coords بتدخل بس لو الـ solver بيمشي في طريق تاني بيها (nn_2opt) أو مفيش matrix أصلاً
+    if isinstance(dist, GeoDistance):
+        return fingerprint(None, coords)
+    if name in COORDINATE_SOLVERS:
+        return fingerprint(dist, coords)
+    return fingerprint(dist)
+
+
+def solve(name, coords=None, dist=None, metric="geo", stats=None, cache=None, **params):
+    """Run solver `name` on coordinates ([lat, lon] rows) and/or a distance matrix.
+
+    metric="euc_2d" treats coords as planar TSPLIB points instead of (lat, lon).
+    The n x n matrix is only built for solvers that need it (up to MAX_MATRIX_BYTES);
+    above LAZY_MATRIX_BYTES, COORDINATE_SOLVERS get a GeoDistance that computes distances
+    from coords on demand instead.
+    stats is a utils.stats.SolverStats for phase timers, a tracemalloc peak or an event
+    callback; by default only the solver's counters are collected.
+    cache is a utils.cache.SolutionCache: a stored result for the same instance, solver
+    version and parameters is returned as is with "cached": True. Instances are keyed on
+    the distance matrix, so a coords call and a matrix-only call share entries (except for
+    COORDINATE_SOLVERS, whose path depends on the coords). Runs with seed=None or any
+    *time_limit set depend on more than their inputs and skip the cache.
+
+    Returns {"solver", "n", "tour", "cost", "time", "stats"}; tour is an open list of
+    city indices and cost is recomputed from the matrix so every solver is measured
+    the same way.
+    """
+    if name not in SOLVERS:
+        raise ValueError(f"unknown solver {name!r}, expected one of {sorted(SOLVERS)}")
+    if coords is not None:
+        coords = np.asarray(coords, dtype=np.float64)
+        if metric == "euc_2d":
+            # الـ adapters بتعتبر coords دايماً lat/lon، فهنا بنسيب الـ matrix بس
+            if dist is None:
+                _check_matrix_size(name, len(coords))
+                dist = euc_2d_matrix(coords)
+            coords = None
+    if dist is None:
+        if coords is None:
+            raise ValueError("solve() needs coords or dist")
+        if name in COORDINATE_SOLVERS and matrix_memory_estimate(len(coords)) > LAZY_MATRIX_BYTES:
+            dist = GeoDistance(coords)
+        else:
+            _check_matrix_size(name, len(coords))
+            dist = distance_matrix(coords)
+    else:
+        dist = np.asarray(dist, dtype=np.float64)
+
+    key = None
+    if cache is not None:
+        full = _full_params(name, params)
+        # من غير seed أو بـ time limit النتيجة بتفرق من run للتاني، فمبتتخزنش
+        timed = any(value is not None for param, value in full.items() if param.endswith("time_limit"))
+        if full.get("seed", 0) is not None and not timed:
+            key = cache_key(_instance_fingerprint(name, coords, dist), name, SOLVER_VERSIONS[name], full)
+            hit = cache.get(key)
+            if hit is not None:
+                hit["cached"] = True
+                return hit
+
+    if stats is None:
+        stats = SolverStats()
+    stats.start()
+    start = time.perf_counter()
+    try:
+        tour = SOLVERS[name](coords, dist, stats, **params)
+    finally:
+        elapsed = time.perf_counter() - start
+        stats.stop()
+    tour = [int(c) for c in tour]
+    result = {"solver": name, "n": len(dist), "tour": tour, "cost": float(tour_length(tour, dist)),
+              "time": elapsed, "stats": stats.as_dict()}
+    if key is not None:
+        cache.put(key, name, SOLVER_VERSIONS[name], result)
+    return result
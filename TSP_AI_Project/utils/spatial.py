@@ -0,0 +1,129 @@
+import math
+
+import numpy as np
+
+from utils.geodesic import unit_vectors
+
+
+class SphereGrid:
+    """Uniform grid over 3-D unit-sphere coordinates with "k nearest alive points" queries.
+
+    Chord length is monotonic in great-circle distance, so ranking by it gives
+    the same neighbours as haversine. Points can be removed (visited) in O(1).
+    """
+
+    def __init__(self, coords, per_cell=2.0):
+        self.xyz = unit_vectors(coords)
+        self.per_cell = per_cell
+        xyz = self.xyz
+        self.x, self.y, self.z = xyz[:, 0].tolist(), xyz[:, 1].tolist(), xyz[:, 2].tolist()
+        self.cell_of = [None] * len(xyz)
+        self._build(np.arange(len(xyz)))
+
+    def _build(self, ids):
+        # الـ grid بيتبني على النقط الباقية بس، فالخلية فيها ~per_cell نقطة طول الوقت
+        xyz = self.xyz[ids]
+        n = len(ids)
+        self.alive = self.built = n
+        self.cells = {}
+        if n == 0:
+            return
+        lo = xyz.min(axis=0)
+        ext = np.sort(xyz.max(axis=0) - lo)
+        # النقط على سطح، فالمساحة تقريباً حاصل ضرب أكبر بعدين
+        area = max(ext[1] * ext[2], 1e-12)
+        self.h = max(math.sqrt(area * self.per_cell / n), 1e-9)
+        ijk = np.floor((xyz - lo) / self.h).astype(np.int64)
+        self.lo = lo
+        # حدود الـ grid في كل محور؛ الـ shells بتتقص عليها عشان المنطقة غالباً رقيقة في محور منهم
+        self.top = ijk.max(axis=0).tolist()
+        cell_of = self.cell_of
+        for i, key in zip(ids.tolist(), map(tuple, ijk.tolist())):
+            cell_of[i] = key
+            self.cells.setdefault(key, []).append(i)
+
+    def __len__(self):
+        return self.alive
+
+    def remove(self, i):
+        key = self.cell_of[i]
+        members = self.cells[key]
+        members.remove(i)
+        if not members:
+            del self.cells[key]
+        self.alive -= 1
+        if self.alive >= 64 and self.alive * 4 < self.built:
+            self._build(np.array([j for members in self.cells.values() for j in members]))
+
+    def _cell(self, i):
+        # النقطة ممكن تكون اتشالت قبل آخر rebuild، فنحسب خليتها من جديد على الـ grid الحالي
+        key = self.cell_of[i]
+        if key is None or self.cells.get(key) is None or i not in self.cells[key]:
+            key = tuple(np.floor((self.xyz[i] - self.lo) / self.h).astype(np.int64).tolist())
+        return key
+
+    def _shell(self, cx, cy, cz, r):
+        # الخلايا اللي على مسافة Chebyshev = r بالظبط، جوه حدود الـ grid بس
+        tx, ty, tz = self.top
+        xs = range(max(cx - r, 0), min(cx + r, tx) + 1)
+        ys = range(max(cy - r, 0), min(cy + r, ty) + 1)
+        zs = range(max(cz - r, 0), min(cz + r, tz) + 1)
+        z_faces = [z for z in (cz - r, cz + r) if 0 <= z <= tz] if r else [cz]
+        for x in xs:
+            x_face = abs(x - cx) == r
+            for y in ys:
+                if x_face or abs(y - cy) == r:
+                    for z in zs:
+                        yield x, y, z
+                else:
+                    for z in z_faces:
+                        yield x, y, z
+
+    def _shell_size(self, cx, cy, cz, r):
+        outer = 1
+        inner = 1
+        for c, t in zip((cx, cy, cz), self.top):
+            outer *= max(min(c + r, t) - max(c - r, 0) + 1, 0)
+            inner *= max(min(c + r - 1, t) - max(c - r + 1, 0) + 1, 0)
+        return outer - (inner if r else 0)
+
+    def nearest(self, i, k):
+        """Up to k alive points nearest to point i (which may itself be removed), closest first."""
+        qx, qy, qz = self.x[i], self.y[i], self.z[i]
+        xs, ys, zs = self.x, self.y, self.z
+        cx, cy, cz = self._cell(i)
+        cells = self.cells
+        # i نفسها ممكن تكون لسه alive، فمش هنلاقي أكتر من len(self) نقطة
+        k = min(k, len(self))
+        if k <= 0:
+            return []
+        # أبعد خلية في الـ grid عن خلية i (اللي ممكن تكون برا الـ grid لو i اتشالت قبل الـ rebuild)
+        reach = max(max(c, t - c) for c, t in zip((cx, cy, cz), self.top))
+        found = []
+        r = 0
+        while True:
+            # لو الـ shell أكبر من عدد الخلايا المليانة، نمشي على الخلايا المليانة على طول
+            if self._shell_size(cx, cy, cz, r) > len(cells):
+                found = []
+                for members in cells.values():
+                    for j in members:
+                        if j != i:
+                            found.append(((xs[j] - qx) ** 2 + (ys[j] - qy) ** 2 + (zs[j] - qz) ** 2, j))
+                break
+            for key in self._shell(cx, cy, cz, r):
+                members = cells.get(key)
+                if members:
+                    for j in members:
+                        if j != i:
+                            found.append(((xs[j] - qx) ** 2 + (ys[j] - qy) ** 2 + (zs[j] - qz) ** 2, j))
+            # أي نقطة لسه متشافتش بعيدة على الأقل r*h
+            if len(found) >= k:
+                found.sort()
+                if found[k - 1][0] <= (r * self.h) ** 2:
+                    return [j for _, j in found[:k]]
+            # r غطت الـ grid كله (مثلاً كل النقط في نفس المكان)، مفيش حاجة تانية نلاقيها
+            if r >= reach:
+                break
+            r += 1
+        found.sort()
+        return [j for _, j in found[:k]]
@@ -0,0 +1,126 @@
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+
+class SolverStats:
+    """Counters, optional phase timers / tracemalloc peak and an event callback for one run.
+
+    Solvers count in local variables inside their hot loops and publish once (add /
+    update / peak), so with timers, memory and callback off a run costs next to nothing.
+    callback(event, data) gets "improvement" ({"cost", "elapsed"}), "phase"
+    ({"phase", "seconds"}) and any solver-specific events such as "generation".
+    """
+
+    def __init__(self, timers=False, memory=False, callback=None):
+        self.timers = timers
+        self.memory = memory
+        self.callback = callback
+        self.counters = {}
+        self.phases = {}
+        self.best_cost = None
+        self.elapsed = None
+        self.peak_memory_mb = None
+        self._start = None
+        self._traced = False
+
+    def start(self):
+        # لو tracemalloc شغال من بره منقفلهوش احنا
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._traced = True
+        if self.memory:
+            tracemalloc.reset_peak()
+        self._start = time.perf_counter()
+        return self
+
+    def stop(self):
+        self.elapsed = self.clock()
+        if self.memory:
+            self.peak_memory_mb = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+            if self._traced:
+                tracemalloc.stop()
+                self._traced = False
+        return self
+
+    def clock(self):
+        return 0.0 if self._start is None else time.perf_counter() - self._start
+
+    def add(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def update(self, values):
+        self.counters.update(values)
+
+    def peak(self, name, value):
+        if value > self.counters.get(name, value - 1):
+            self.counters[name] = value
+
+    def phase(self, name):
+        # with stats.phase("construction"): ...
+        return self._timed_phase(name) if self.timers else nullcontext()
+
+    @contextmanager
+    def _timed_phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+            self.emit("phase", phase=name, seconds=seconds)
+
+    def timed(self, name, fn):
+        """fn itself, or (with timers on) a wrapper adding its run time to phase `name`."""
+        if not self.timers:
+            return fn
+        phases, clock = self.phases, time.perf_counter
+        phases.setdefault(name, 0.0)
+
+        def wrapper(*args):
+            start = clock()
+            result = fn(*args)
+            phases[name] += clock() - start
+            return result
+        return wrapper
+
+    def improved(self, cost):
+        self.counters["improvements"] = self.counters.get("improvements", 0) + 1
+        self.best_cost = cost
+        if self.callback is not None:
+            self.callback("improvement", {"cost": cost, "elapsed": self.clock()})
+
+    def emit(self, event, **data):
+        if self.callback is not None:
+            self.callback(event, data)
+
+    def as_dict(self):
+        out = dict(self.counters)
+        if self.phases:
+            out["phase_seconds"] = dict(self.phases)
+        if self.elapsed:
+            if "improvements" in out:
+                out["improvements_per_second"] = out["improvements"] / self.elapsed
+            if out.get("iterations"):
+                out["seconds_per_iteration"] = self.elapsed / out["iterations"]
+        if self.peak_memory_mb is not None:
+            out["traced_peak_memory_mb"] = self.peak_memory_mb
+        return out
+
+
+class _NoStats(SolverStats):
+    # الـ default لما محدش طلب stats: كل حاجة no-op
+    def add(self, name, amount=1):
+        pass
+
+    def update(self, values):
+        pass
+
+    def peak(self, name, value):
+        pass
+
+    def improved(self, cost):
+        pass
+
+
+NO_STATS = _NoStats()
@@ -0,0 +1,57 @@
+def positions(tour):
+    """pos[city] = index of city in tour."""
+    pos = [0] * len(tour)
+    for i, city in enumerate(tour):
+        pos[city] = i
+    return pos
+
+
+def reverse_segment(tour, pos, i, j):
+    """Reverse tour[i..j] in place (cyclic, inclusive), keeping pos in sync.
+
+    Reversing the complement gives the same cycle, so the shorter side is reversed.
+    """
+    n = len(tour)
+    inner = (j - i) % n + 1
+    if 2 * inner > n:
+        i, j = (j + 1) % n, (i - 1) % n
+        inner = n - inner
+    if i <= j:
+        tour[i:j + 1] = tour[i:j + 1][::-1]
+        for k in range(i, j + 1):
+            pos[tour[k]] = k
+        return
+    for _ in range(inner // 2):
+        a, b = tour[i], tour[j]
+        tour[i], tour[j] = b, a
+        pos[b], pos[a] = i, j
+        i = i + 1 if i + 1 < n else 0
+        j = j - 1 if j > 0 else n - 1
+
+
+def move_segment(tour, pos, start, length, after, reverse=False):
+    """Cut tour[start:start+length] (cyclic) and re-insert it between `after` and its successor.
+
+    `after` must lie outside the segment. Only the cities between the old and
+    new place are shifted, walking whichever side of the cycle is shorter.
+    """
+    n = len(tour)
+    block = [tour[(start + t) % n] for t in range(length)]
+    if reverse:
+        block.reverse()
+    fwd = (pos[after] - start) % n + 1           # block + cities up to `after`
+    bwd = (start + length - 1 - pos[after]) % n  # cities after `after` + block
+    if fwd <= bwd:
+        base = start
+        span = fwd
+        rest = [tour[(start + t) % n] for t in range(length, span)]
+        new = rest + block
+    else:
+        base = (pos[after] + 1) % n
+        span = bwd
+        rest = [tour[(base + t) % n] for t in range(span - length)]
+        new = block + rest
+    for t, city in enumerate(new):
+        idx = (base + t) % n
+        tour[idx] = city
+        pos[city] = idx
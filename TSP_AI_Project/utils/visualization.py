@@ -0,0 +1,125 @@
+import os
+import sys
+
+import numpy as np
+
+# folium بياخد ~0.5s في الـ import، فبيتعمله import جوه الدوال اللي بترسم بس
+# (الـ solvers و الـ batch workers مبيحتاجوهوش خالص)
+
+# فوق الحجم ده الـ visualizers بتاعة كل خوارزمية بتحول لـ tour_map بدل marker + polyline لكل مدينة
+LARGE_TOUR = 200
+# الـ markers بتترسم circles على canvas لحد الحجم ده، وبعده clustering
+CIRCLE_LIMIT = 20000
+# أقصى عدد نقط في خط الـ tour بعد الـ simplification
+MAX_LINE_POINTS = 20000
+DECIMALS = 5  # ~1 متر؛ بيصغر الـ HTML
+
+
+def headless():
+    """True with --headless on the command line or TSP_HEADLESS set (not "0"): no HTML, no browser."""
+    return "--headless" in sys.argv or os.environ.get("TSP_HEADLESS", "0") not in ("", "0")
+
+
+def open_in_browser(path):
+    if headless():
+        return
+    import webbrowser
+    webbrowser.open("file://" + os.path.realpath(path))
+
+
+def simplify(points, tolerance):
+    """Drop points that are within tolerance (degrees) of the segment joining their neighbours.
+
+    Works in vectorized rounds instead of Douglas-Peucker's one-split-per-step loop: each
+    round tests every interior point against its current neighbours and removes the close
+    ones, alternating even/odd positions so two neighbours never go in the same round.
+    Endpoints always stay. Error can add up over rounds, but stays around the tolerance.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    tol2 = tolerance * tolerance
+    parity, idle = 0, 0
+    while len(points) > 2 and idle < 2:
+        a, mid, b = points[:-2], points[1:-1], points[2:]
+        ab, rel = b - a, mid - a
+        length2 = np.einsum("ij,ij->i", ab, ab)
+        t = np.clip(np.einsum("ij,ij->i", rel, ab) / np.where(length2 > 0, length2, 1.0), 0.0, 1.0)
+        rel = rel - t[:, None] * ab
+        drop = np.einsum("ij,ij->i", rel, rel) <= tol2
+        drop[parity::2] = False
+        parity ^= 1
+        if drop.any():
+            points = points[np.concatenate(([True], ~drop, [True]))]
+            idle = 0
+        else:
+            idle += 1
+    return points
+
+
+def display_line(coords, tour, tolerance=None, max_points=MAX_LINE_POINTS):
+    """Closed tour as a simplified list of [lat, lon] for drawing.
+
+    The default tolerance is 1/2000 of the bounding box, about a pixel on a map that
+    shows the whole tour; it doubles until at most max_points are left.
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    points = coords[np.append(tour, tour[0])]
+    if tolerance is None:
+        tolerance = float((points.max(axis=0) - points.min(axis=0)).max()) / 2000
+    line = simplify(points, tolerance)
+    while len(line) > max_points and tolerance > 0:
+        tolerance *= 2
+        line = simplify(line, tolerance)
+    return np.round(line, DECIMALS).tolist()
+
+
+def tour_map(coords, tour, title=None, color="blue", markers="auto", tolerance=None, start_name=None):
+    """Folium map of a large tour: one polyline layer plus one layer for all the cities.
+
+    markers: "circles" (canvas circle markers in a single GeoJSON layer), "cluster"
+    (FastMarkerCluster), "none", or "auto" (circles up to CIRCLE_LIMIT cities).
+    """
+    import folium
+    from folium.plugins import FastMarkerCluster
+
+    coords = np.asarray(coords, dtype=np.float64)
+    tour = np.asarray(tour, dtype=np.intp)
+    if markers == "auto":
+        markers = "circles" if len(tour) <= CIRCLE_LIMIT else "cluster"
+
+    lo, hi = coords[tour].min(axis=0), coords[tour].max(axis=0)
+    # prefer_canvas: كل الـ vector layers على canvas واحد بدل SVG element لكل نقطة
+    m = folium.Map(prefer_canvas=True)
+    m.fit_bounds([lo.tolist(), hi.tolist()])
+
+    folium.PolyLine(display_line(coords, tour, tolerance), color=color, weight=2, opacity=0.8).add_to(m)
+
+    points = np.round(coords[tour], DECIMALS)
+    if markers == "circles":
+        # GeoJSON بيبقى lon, lat
+        multipoint = {"type": "MultiPoint", "coordinates": points[:, ::-1].tolist()}
+        folium.GeoJson(
+            {"type": "Feature", "properties": {}, "geometry": multipoint},
+            marker=folium.CircleMarker(radius=2, fill=True, fill_opacity=0.8, weight=0),
+            style_function=lambda _: {"color": color, "fillColor": color},
+        ).add_to(m)
+    elif markers == "cluster":
+        FastMarkerCluster(points.tolist()).add_to(m)
+    elif markers != "none":
+        raise ValueError(f"unknown markers mode {markers!r}")
+
+    folium.Marker(coords[tour[0]].tolist(), popup=f"Start: {start_name or tour[0]}",
+                  icon=folium.Icon(color="green", icon="info-sign")).add_to(m)
+
+    if title:
+        title_html = f'''
+            <div style="position: fixed;
+                        top: 10px; left: 50px; width: 500px;
+                        background-color: white; border:2px solid grey;
+                        z-index:9999; font-size:20px; padding: 10px;
+                        border-radius: 10px; box-shadow: 0 4px 8px rgba(0,0,0,0.2);
+                        font-weight: bold; text-align: center;">
+                {title}
+            </div>
+        '''
+        m.get_root().html.add_child(folium.Element(title_html))
+    return m